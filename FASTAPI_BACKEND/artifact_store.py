@@ -0,0 +1,270 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+# 사전 압축본 파일 접미사 (Content-Encoding → 확장자)
+ENCODING_SUFFIXES = {
+    'br': '.br',
+    'gzip': '.gz',
+}
+
+# source map 파일 접미사 (예: abc.min.js → abc.min.js.map)
+SOURCE_MAP_SUFFIX = '.map'
+
+
+class ArtifactIndex(ABC):
+    """file_id → 압축 결과 파일 정보를 보관하는 인덱스 (구현체 교체 가능)
+
+    레코드는 dict 로 다루며 다음 키를 가집니다.
+        file_id, path(Path), filename, media_type, content_hash,
+        original_size, minified_size, digest, encodings(list), has_source_map,
+        created_at, expires_at
+    digest 는 저장된 파일 내용의 SHA-256, encodings 는 함께 저장된 사전 압축본 목록,
+    has_source_map 은 source map(.map) 파일을 함께 저장했는지 여부입니다.
+    구현체는 close 를 제외한 모든 메서드를 구현해야 하며, 빠진 것이 있으면 생성 시점에 TypeError 가 납니다.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+
+    @abstractmethod
+    def put(self, file_id: str, path: Path, filename: str, media_type: str = 'application/javascript',
+            content_hash: str = None, original_size: int = 0, minified_size: int = 0,
+            digest: str = None, encodings: list = (), has_source_map: bool = False):
+        ...
+
+    @abstractmethod
+    def get(self, file_id: str):
+        """만료되지 않은 레코드를 반환. 없으면 None"""
+        ...
+
+    @abstractmethod
+    def find_by_hash(self, content_hash: str):
+        """같은 원본 해시로 만들어진, 만료되지 않은 레코드를 반환. 없으면 None"""
+        ...
+
+    @abstractmethod
+    def touch(self, file_id: str):
+        """만료 시각을 지금부터 ttl 초 뒤로 연장"""
+        ...
+
+    @abstractmethod
+    def delete(self, file_id: str):
+        ...
+
+    @abstractmethod
+    def pop_expired(self) -> list:
+        """만료된 레코드를 인덱스에서 제거하고 반환 (파일 삭제는 호출 측에서)"""
+        ...
+
+    def close(self):
+        pass
+
+
+class MemoryArtifactIndex(ArtifactIndex):
+    """프로세스 내부 dict 기반 인덱스 (워커 1개로 실행할 때나 테스트용)"""
+
+    def __init__(self, ttl: float):
+        super().__init__(ttl)
+        self._records = {}
+
+    def put(self, file_id, path, filename, media_type='application/javascript',
+            content_hash=None, original_size=0, minified_size=0, digest=None, encodings=(),
+            has_source_map=False):
+        now = time.time()
+        self._records[file_id] = {
+            'file_id': file_id,
+            'path': Path(path),
+            'filename': filename,
+            'media_type': media_type,
+            'content_hash': content_hash,
+            'original_size': original_size,
+            'minified_size': minified_size,
+            'digest': digest,
+            'encodings': list(encodings),
+            'has_source_map': has_source_map,
+            'created_at': now,
+            'expires_at': now + self.ttl,
+        }
+
+    def get(self, file_id):
+        record = self._records.get(file_id)
+        if record is None or record['expires_at'] <= time.time():
+            return None
+        return record
+
+    def find_by_hash(self, content_hash):
+        now = time.time()
+        for record in self._records.values():
+            if record['content_hash'] == content_hash and record['expires_at'] > now:
+                return record
+        return None
+
+    def touch(self, file_id):
+        record = self._records.get(file_id)
+        if record is not None:
+            record['expires_at'] = time.time() + self.ttl
+
+    def delete(self, file_id):
+        self._records.pop(file_id, None)
+
+    def pop_expired(self):
+        now = time.time()
+        expired = [r for r in self._records.values() if r['expires_at'] <= now]
+        for record in expired:
+            del self._records[record['file_id']]
+        return expired
+
+
+class SQLiteArtifactIndex(ArtifactIndex):
+    """SQLite 파일 기반 인덱스 - 같은 서버의 여러 uvicorn 워커가 공유"""
+
+    COLUMNS = ('file_id', 'path', 'filename', 'media_type', 'content_hash',
+               'original_size', 'minified_size', 'digest', 'encodings', 'has_source_map', 'created_at', 'expires_at')
+
+    def __init__(self, db_path: str, ttl: float):
+        super().__init__(ttl)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False,
+                                     isolation_level=None)
+        # WAL: 읽기와 쓰기가 서로를 막지 않도록 설정
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                file_id       TEXT PRIMARY KEY,
+                path          TEXT NOT NULL,
+                filename      TEXT NOT NULL,
+                media_type    TEXT NOT NULL,
+                content_hash  TEXT,
+                original_size INTEGER NOT NULL DEFAULT 0,
+                minified_size INTEGER NOT NULL DEFAULT 0,
+                digest        TEXT,
+                encodings     TEXT NOT NULL DEFAULT '',
+                has_source_map INTEGER NOT NULL DEFAULT 0,
+                created_at    REAL NOT NULL,
+                expires_at    REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_artifacts_hash ON artifacts(content_hash);
+            CREATE INDEX IF NOT EXISTS idx_artifacts_expires ON artifacts(expires_at);
+        """)
+        # 이전 버전에서 만든 DB 에 없는 컬럼 추가
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(artifacts)")}
+        if 'digest' not in existing:
+            self._conn.execute("ALTER TABLE artifacts ADD COLUMN digest TEXT")
+        if 'encodings' not in existing:
+            self._conn.execute("ALTER TABLE artifacts ADD COLUMN encodings TEXT NOT NULL DEFAULT ''")
+        if 'has_source_map' not in existing:
+            self._conn.execute("ALTER TABLE artifacts ADD COLUMN has_source_map INTEGER NOT NULL DEFAULT 0")
+
+    def _to_record(self, row):
+        if row is None:
+            return None
+        record = dict(zip(self.COLUMNS, row))
+        record['path'] = Path(record['path'])
+        record['encodings'] = [e for e in record['encodings'].split(',') if e]
+        record['has_source_map'] = bool(record['has_source_map'])
+        return record
+
+    def put(self, file_id, path, filename, media_type='application/javascript',
+            content_hash=None, original_size=0, minified_size=0, digest=None, encodings=(),
+            has_source_map=False):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO artifacts ({', '.join(self.COLUMNS)}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (file_id, str(path), filename, media_type, content_hash,
+                 original_size, minified_size, digest, ','.join(encodings), int(has_source_map),
+                 now, now + self.ttl)
+            )
+
+    def get(self, file_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM artifacts WHERE file_id = ? AND expires_at > ?",
+                (file_id, time.time())
+            ).fetchone()
+        return self._to_record(row)
+
+    def find_by_hash(self, content_hash):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM artifacts "
+                "WHERE content_hash = ? AND expires_at > ? ORDER BY created_at DESC LIMIT 1",
+                (content_hash, time.time())
+            ).fetchone()
+        return self._to_record(row)
+
+    def touch(self, file_id):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE artifacts SET expires_at = ? WHERE file_id = ?",
+                (time.time() + self.ttl, file_id)
+            )
+
+    def delete(self, file_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM artifacts WHERE file_id = ?", (file_id,))
+
+    def pop_expired(self):
+        now = time.time()
+        with self._lock:
+            # 여러 워커의 스위퍼가 동시에 돌아도 같은 레코드를 중복 처리하지 않도록 쓰기 잠금 획득
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(self.COLUMNS)} FROM artifacts WHERE expires_at <= ?", (now,)
+                ).fetchall()
+                self._conn.execute("DELETE FROM artifacts WHERE expires_at <= ?", (now,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [self._to_record(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_artifact_index(url: str, ttl: float) -> ArtifactIndex:
+    """설정 문자열로 인덱스 생성
+
+    - sqlite:///artifacts.db  → SQLiteArtifactIndex (기본)
+    - memory://               → MemoryArtifactIndex
+    """
+    if url.startswith('sqlite:///'):
+        return SQLiteArtifactIndex(url[len('sqlite:///'):], ttl)
+    if url.startswith('memory://'):
+        return MemoryArtifactIndex(ttl)
+    raise ValueError(f"지원하지 않는 artifact index 설정입니다: {url}")
+
+
+def variant_path(path: Path, encoding: str) -> Path:
+    """사전 압축본 경로 (예: abc.min.js → abc.min.js.gz)"""
+    return path.with_name(path.name + ENCODING_SUFFIXES[encoding])
+
+
+def source_map_path(path: Path) -> Path:
+    """source map 경로 (예: abc.min.js → abc.min.js.map)"""
+    return path.with_name(path.name + SOURCE_MAP_SUFFIX)
+
+
+def delete_artifact_files(path: Path):
+    """압축 결과 파일과 사전 압축본, source map 을 함께 삭제"""
+    path.unlink(missing_ok=True)
+    source_map_path(path).unlink(missing_ok=True)
+    for encoding in ENCODING_SUFFIXES:
+        variant_path(path, encoding).unlink(missing_ok=True)
+
+
+def remove_expired_files(index: ArtifactIndex) -> int:
+    """만료된 레코드를 제거하고 해당 파일을 삭제. 삭제한 레코드 수를 반환"""
+    expired = index.pop_expired()
+    for record in expired:
+        delete_artifact_files(record['path'])
+    return len(expired)
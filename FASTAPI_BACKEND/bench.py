@@ -0,0 +1,388 @@
+"""/minify, /download 부하 테스트
+
+로컬 uvicorn 을 띄운 뒤 JS 코퍼스를 동시성 단계별로 업로드/다운로드하고
+지연 시간 백분위수(p50/p95/p99), 초당 요청 수, 서버 최대 RSS, 압축률 분포를 JSON 으로 저장합니다.
+
+사용 예:
+    python bench.py --corpus ../sExam --concurrency 1,8,32 --requests 200
+    python bench.py --url http://localhost:8000 --no-download     # 이미 실행 중인 서버 측정
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+# psutil 은 선택 패키지: 없으면 /proc (Linux) 에서 RSS 를 읽음
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BACKEND_DIR = Path(__file__).resolve().parent
+RSS_SAMPLE_INTERVAL = 0.1
+
+
+def load_corpus(paths: list, max_files: int) -> list:
+    """경로(파일 또는 디렉토리) 목록에서 .js 파일을 모아 (이름, 내용) 목록으로 반환 (.min.js 제외)"""
+    files = []
+    for path in map(Path, paths):
+        candidates = [path] if path.is_file() else sorted(path.rglob('*.js'))
+        for candidate in candidates:
+            if candidate.name.endswith('.min.js'):
+                continue
+            try:
+                content = candidate.read_bytes()
+                content.decode('utf-8')
+            except (OSError, UnicodeDecodeError):
+                continue
+            files.append((candidate.name, content))
+    if max_files:
+        # 크기가 고르게 섞이도록 정렬 후 균등 추출
+        files.sort(key=lambda item: len(item[1]))
+        step = max(len(files) / max_files, 1)
+        files = [files[int(i * step)] for i in range(min(max_files, len(files)))]
+    return files
+
+
+def percentile(sorted_values: list, p: float):
+    """선형 보간 백분위수 (sorted_values 는 정렬된 목록)"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def latency_summary(latencies: list) -> dict:
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50) * 1000, 2) if values else None,
+        'p95_ms': round(percentile(values, 95) * 1000, 2) if values else None,
+        'p99_ms': round(percentile(values, 99) * 1000, 2) if values else None,
+        'max_ms': round(values[-1] * 1000, 2) if values else None,
+    }
+
+
+def ratio_distribution(ratios: list) -> dict:
+    """압축률(%) 분포: 백분위수와 10% 단위 구간별 개수"""
+    values = sorted(ratios)
+    buckets = {f"{low}-{low + 10}": 0 for low in range(0, 100, 10)}
+    for ratio in values:
+        low = min(max(int(ratio // 10) * 10, 0), 90)
+        buckets[f"{low}-{low + 10}"] += 1
+    return {
+        'count': len(values),
+        'min': values[0] if values else None,
+        'p25': round(percentile(values, 25), 2) if values else None,
+        'p50': round(percentile(values, 50), 2) if values else None,
+        'p75': round(percentile(values, 75), 2) if values else None,
+        'max': values[-1] if values else None,
+        'buckets': buckets,
+    }
+
+
+def _proc_children(pid: int) -> list:
+    children = []
+    try:
+        for task in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{task}/children') as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _proc_rss(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss(pid: int):
+    """pid 와 모든 자식 프로세스(uvicorn 워커, minify 워커)의 RSS 합계. 측정할 수 없으면 None"""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total
+
+    if not os.path.exists(f'/proc/{pid}'):
+        return None
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        total += _proc_rss(current)
+        pending.extend(_proc_children(current))
+    return total
+
+
+class RssSampler:
+    """측정 구간 동안 서버 프로세스 트리의 RSS 를 주기적으로 샘플링하여 최댓값 기록"""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.peak = None
+        self._task = None
+
+    async def _run(self):
+        while True:
+            rss = process_tree_rss(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+            await asyncio.sleep(RSS_SAMPLE_INTERVAL)
+
+    def start(self):
+        self.peak = None
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return self.peak
+
+
+def start_server(port: int, workers: int, work_dir: str, env_overrides: dict) -> subprocess.Popen:
+    """작업 디렉토리(work_dir)를 기준으로 uvicorn 실행 (uploads/, minified/, artifacts.db 가 여기에 생김)"""
+    env = dict(os.environ, **env_overrides)
+    command = [sys.executable, '-m', 'uvicorn', 'main:app', '--app-dir', str(BACKEND_DIR),
+               '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+               '--log-level', 'warning']
+    return subprocess.Popen(command, cwd=work_dir, env=env)
+
+
+async def wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"서버가 종료되었습니다 (exit code {server.returncode})")
+        try:
+            response = await client.get('/engine/stats')
+            if response.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("서버가 시작되지 않았습니다.")
+
+
+async def run_level(client: httpx.AsyncClient, corpus: list, concurrency: int, total_requests: int,
+                    download: bool, bust_cache: bool, run_tag: str) -> dict:
+    """동시성 concurrency 로 total_requests 개의 업로드(+다운로드)를 실행"""
+    minify_latencies = []
+    download_latencies = []
+    ratios = []
+    statuses = {}
+    queue = asyncio.Queue()
+    for sequence in range(total_requests):
+        queue.put_nowait(sequence)
+
+    async def worker():
+        while True:
+            try:
+                sequence = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            name, content = corpus[sequence % len(corpus)]
+            if bust_cache:
+                # 캐시 적중을 피하도록 요청마다 내용을 조금씩 다르게 만듦
+                content = content + f"\n// bench {run_tag} {concurrency} {sequence}\n".encode()
+
+            started = time.perf_counter()
+            try:
+                response = await client.post('/minify', files={'file': (name, content)})
+            except httpx.TransportError as e:
+                key = f"minify {type(e).__name__}"
+                statuses[key] = statuses.get(key, 0) + 1
+                continue
+            latency = time.perf_counter() - started
+            key = f"minify {response.status_code}"
+            statuses[key] = statuses.get(key, 0) + 1
+            if response.status_code != 200:
+                # 503 (대기열 초과) 등은 지연 시간 통계에서 제외하고 statuses 로만 집계
+                continue
+            minify_latencies.append(latency)
+
+            body = response.json()
+            ratios.append(body['compression_ratio'])
+            if download:
+                started = time.perf_counter()
+                response = await client.get(f"/download/{body['file_id']}",
+                                            headers={'Accept-Encoding': 'br, gzip'})
+                download_latencies.append(time.perf_counter() - started)
+                key = f"download {response.status_code}"
+                statuses[key] = statuses.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    # 초당 요청 수는 엔드포인트별로 따로 계산 (다운로드를 합치면 /minify 처리량이 부풀려짐)
+    minify_completed = sum(count for key, count in statuses.items() if key.startswith('minify '))
+    return {
+        'concurrency': concurrency,
+        'requests': total_requests,
+        'elapsed_seconds': round(elapsed, 3),
+        'requests_per_second': round(minify_completed / elapsed, 2) if elapsed else None,
+        'uploads_per_second': round(len(minify_latencies) / elapsed, 2) if elapsed else None,
+        'downloads_per_second': round(len(download_latencies) / elapsed, 2) if download and elapsed else None,
+        'minify_latency': latency_summary(minify_latencies),
+        'download_latency': latency_summary(download_latencies) if download else None,
+        'statuses': statuses,
+        'compression_ratio': ratio_distribution(ratios),
+    }
+
+
+def environment_info() -> dict:
+    info = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+    try:
+        import rjsmin
+        info['rjsmin'] = rjsmin.__version__
+    except ImportError:
+        pass
+    try:
+        info['git_commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return info
+
+
+async def run_benchmark(args) -> dict:
+    corpus = load_corpus(args.corpus, args.max_files)
+    if not corpus:
+        raise SystemExit("코퍼스에서 .js 파일을 찾지 못했습니다.")
+    sizes = sorted(len(content) for _, content in corpus)
+    print(f"코퍼스: {len(corpus)}개 파일, 총 {sum(sizes) / 1024:.1f}KB, 중앙값 {percentile(sizes, 50) / 1024:.1f}KB")
+
+    server = None
+    work_dir = None
+    base_url = args.url
+    if base_url is None:
+        work_dir = tempfile.TemporaryDirectory(prefix='minify-bench-')
+        env = {'ARTIFACT_INDEX_URL': f"sqlite:///{Path(work_dir.name) / 'artifacts.db'}"}
+        if args.minify_workers:
+            env['MINIFY_WORKERS'] = str(args.minify_workers)
+        server = start_server(args.port, args.workers, work_dir.name, env)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    run_tag = str(int(time.time()))
+    levels = []
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await wait_until_ready(client, server)
+            sampler = RssSampler(server.pid) if server is not None else None
+            for concurrency in args.concurrency:
+                if sampler is not None:
+                    sampler.start()
+                level = await run_level(client, corpus, concurrency, args.requests,
+                                        args.download, not args.allow_cache_hits, run_tag)
+                level['peak_rss_bytes'] = await sampler.stop() if sampler is not None else None
+                levels.append(level)
+                latency = level['minify_latency']
+                message = (f"동시성 {concurrency:>3}: /minify {level['requests_per_second']} req/s, "
+                           f"minify p50 {latency['p50_ms']}ms p95 {latency['p95_ms']}ms p99 {latency['p99_ms']}ms")
+                if level['peak_rss_bytes']:
+                    message += f", 최대 RSS {level['peak_rss_bytes'] / 1024 / 1024:.1f}MB"
+                print(message)
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if work_dir is not None:
+            work_dir.cleanup()
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': environment_info(),
+        'settings': {
+            'url': args.url,
+            'uvicorn_workers': args.workers if args.url is None else None,
+            'minify_workers': args.minify_workers or None,
+            'requests_per_level': args.requests,
+            'download': args.download,
+            'cache_hits_allowed': args.allow_cache_hits,
+        },
+        'corpus': {
+            'files': len(corpus),
+            'total_bytes': sum(sizes),
+            'median_bytes': percentile(sizes, 50),
+            'max_bytes': sizes[-1],
+        },
+        'levels': levels,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="minify 서비스 부하 테스트")
+    parser.add_argument('--corpus', nargs='+', default=[str(BACKEND_DIR.parent / 'sExam')],
+                        help="JS 파일 또는 디렉토리 (기본: ../sExam)")
+    parser.add_argument('--max-files', type=int, default=0, help="코퍼스에서 사용할 최대 파일 수 (0 이면 전체)")
+    parser.add_argument('--concurrency', default='1,4,16',
+                        type=lambda value: [int(v) for v in value.split(',')],
+                        help="쉼표로 구분한 동시성 단계 (기본: 1,4,16)")
+    parser.add_argument('--requests', type=int, default=200, help="단계별 업로드 요청 수 (기본: 200)")
+    parser.add_argument('--no-download', dest='download', action='store_false',
+                        help="업로드 후 /download 요청을 하지 않음")
+    parser.add_argument('--allow-cache-hits', action='store_true',
+                        help="같은 내용을 그대로 재업로드 (기본은 요청마다 내용을 바꿔 캐시를 우회)")
+    parser.add_argument('--url', help="이미 실행 중인 서버 주소 (지정하면 서버를 띄우지 않고 RSS 도 측정하지 않음)")
+    parser.add_argument('--port', type=int, default=8765, help="띄울 서버 포트 (기본: 8765)")
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn 워커 수 (기본: 1)")
+    parser.add_argument('--minify-workers', type=int, default=0, help="MINIFY_WORKERS (기본: CPU 코어 수)")
+    parser.add_argument('--timeout', type=float, default=60, help="요청 타임아웃(초)")
+    parser.add_argument('--output', default=None,
+                        help="결과 JSON 경로 (기본: bench_results/bench-<시각>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = asyncio.run(run_benchmark(args))
+
+    output = Path(args.output) if args.output else (
+        BACKEND_DIR / 'bench_results' / f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
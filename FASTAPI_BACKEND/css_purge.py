@@ -0,0 +1,320 @@
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+import re
+
+# 블록 안의 규칙을 다시 검사하는 at-rule (나머지 @font-face, @keyframes 등은 그대로 유지)
+NESTED_AT_RULES = ('@media', '@supports', '@layer', '@container', '@document', '@-moz-document')
+
+# 상태 클래스/동적 선택자 등을 제거하는 의사 클래스·의사 요소 (:hover, ::after, :not(.a) ...)
+PSEUDO_PATTERN = re.compile(r'(?<!\\)::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?')
+
+# 복합 선택자 하나를 구성하는 단순 선택자 (#id, .class, [attr], 태그)
+SIMPLE_SELECTOR_PATTERN = re.compile(
+    r'#((?:[\w-]|\\.)+)'
+    r'|\.((?:[\w-]|\\.)+)'
+    r'|\[\s*((?:[\w-]|\\.)+)[^\]]*\]'
+    r'|((?:[\w-]|\\.)+|\*)'
+)
+
+# 괄호/대괄호/따옴표 밖에서만 복합 선택자를 나누는 결합자
+COMBINATORS = frozenset(' \t\r\n\f>+~')
+ESCAPE_PATTERN = re.compile(r'\\(.)')
+
+
+@dataclass
+class HtmlIndex:
+    """HTML 문서들에 등장하는 태그, id, class, 속성 이름 집합"""
+    tags: set = field(default_factory=set)
+    ids: set = field(default_factory=set)
+    classes: set = field(default_factory=set)
+    attributes: set = field(default_factory=set)
+
+    def add_safelist(self, names):
+        """스크립트로만 붙는 상태 클래스 등 HTML 에 없어도 유지할 이름 추가"""
+        for name in names:
+            name = name.strip()
+            if name.startswith('.'):
+                self.classes.add(name[1:])
+            elif name.startswith('#'):
+                self.ids.add(name[1:])
+            elif name:
+                self.classes.add(name)
+                self.ids.add(name)
+                self.tags.add(name.lower())
+
+
+class _IndexBuilder(HTMLParser):
+    def __init__(self, index: HtmlIndex):
+        super().__init__(convert_charrefs=True)
+        self.index = index
+
+    def handle_starttag(self, tag, attrs):
+        index = self.index
+        index.tags.add(tag)
+        for name, value in attrs:
+            index.attributes.add(name)
+            if not value:
+                continue
+            if name == 'id':
+                index.ids.add(value.strip())
+            elif name == 'class':
+                index.classes.update(value.split())
+
+
+def build_html_index(documents) -> HtmlIndex:
+    """HTML 문자열 목록을 한 번씩만 파싱하여 인덱스 생성"""
+    index = HtmlIndex()
+    # html/body 는 HTML 에 명시하지 않아도 항상 존재
+    index.tags.update(('html', 'head', 'body'))
+    builder = _IndexBuilder(index)
+    for document in documents:
+        builder.feed(document)
+        builder.close()
+        builder.reset()
+    return index
+
+
+class SelectorMatcher:
+    """선택자가 인덱스 기준으로 일치할 가능성이 있는지 판정 (결과는 선택자별로 캐시)
+
+    요소 간 관계(자손, 형제)와 의사 클래스는 보지 않고, 선택자에 쓰인 태그/id/class/속성이
+    모두 문서 어딘가에 존재하면 일치 가능으로 판단합니다. 애매하면 항상 남기는 쪽을 택합니다.
+    """
+
+    def __init__(self, index: HtmlIndex):
+        self.index = index
+        self._cache = {}
+
+    def matches(self, selector: str) -> bool:
+        result = self._cache.get(selector)
+        if result is None:
+            result = self._cache[selector] = self._matches(selector)
+        return result
+
+    def _matches(self, selector: str) -> bool:
+        index = self.index
+        for compound in _split_compounds(selector):
+            if ':' in compound:
+                compound = PSEUDO_PATTERN.sub(' ', compound)
+            for id_name, class_name, attribute, tag in SIMPLE_SELECTOR_PATTERN.findall(compound):
+                if id_name:
+                    if ESCAPE_PATTERN.sub(r'\1', id_name) not in index.ids:
+                        return False
+                elif class_name:
+                    if ESCAPE_PATTERN.sub(r'\1', class_name) not in index.classes:
+                        return False
+                elif attribute:
+                    if attribute.lower() not in index.attributes:
+                        return False
+                elif tag and tag != '*':
+                    if tag.lower() not in index.tags:
+                        return False
+        return True
+
+
+def _split_compounds(selector: str) -> list:
+    """선택자를 복합 선택자 목록으로 분리
+
+    결합자(공백, >, +, ~)는 괄호/대괄호/따옴표 밖에 있을 때만 인정합니다.
+    속성 값의 문자열은 비우고('[title=""]') 의사 클래스의 인자는 버립니다(':not()'),
+    인자 안의 이름은 일치 여부를 제한하지 않기 때문입니다.
+    """
+    compounds = []
+    current = []
+    depth = 0       # '(' 중첩
+    bracket = 0     # '[' 중첩
+    quote = None
+    i = 0
+    size = len(selector)
+    while i < size:
+        ch = selector[i]
+        if ch == '\\':
+            if not quote and not depth:
+                current.append(selector[i:i + 2])
+            i += 2
+            continue
+        if quote:
+            if ch == quote:
+                quote = None
+                if not depth:
+                    current.append(ch)
+        elif ch in '"\'':
+            quote = ch
+            if not depth:
+                current.append(ch)
+        elif ch == '(':
+            if not depth:
+                current.append(ch)
+            depth += 1
+        elif ch == ')':
+            depth = max(depth - 1, 0)
+            if not depth:
+                current.append(ch)
+        elif depth:
+            pass
+        elif ch == '[':
+            bracket += 1
+            current.append(ch)
+        elif ch == ']':
+            bracket = max(bracket - 1, 0)
+            current.append(ch)
+        elif ch in COMBINATORS and not bracket:
+            if current:
+                compounds.append(''.join(current))
+                current = []
+        else:
+            current.append(ch)
+        i += 1
+    if current:
+        compounds.append(''.join(current))
+    return compounds
+
+
+def _split_top_level(text: str, separator: str) -> list:
+    """괄호/따옴표 밖의 separator 로 분리 (선택자 목록의 쉼표 등)"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _parse_blocks(css: str, start: int = 0):
+    """css[start:] 을 (prelude, body) 목록으로 분해
+
+    body 는 '{...}' 안쪽 문자열, 블록이 없는 문장(@import ...;)은 body 가 None 입니다.
+    Returns:
+        (블록 목록, 닫는 '}' 다음 위치 또는 끝)
+    """
+    blocks = []
+    size = len(css)
+    i = start
+    prelude_start = start
+    while i < size:
+        ch = css[i]
+        if ch == '/' and css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = size if end == -1 else end + 2
+            continue
+        if ch in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if ch == ';':
+            prelude = css[prelude_start:i].strip()
+            if prelude:
+                blocks.append((prelude, None))
+            i += 1
+            prelude_start = i
+        elif ch == '{':
+            body_end = _find_block_end(css, i + 1)
+            blocks.append((css[prelude_start:i].strip(), css[i + 1:body_end]))
+            i = body_end + 1
+            prelude_start = i
+        elif ch == '}':
+            return blocks, i + 1
+        else:
+            i += 1
+    return blocks, size
+
+
+def _skip_string(css: str, i: int) -> int:
+    quote = css[i]
+    i += 1
+    size = len(css)
+    while i < size:
+        ch = css[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == quote or ch == '\n':
+            return i + 1
+        i += 1
+    return size
+
+
+def _find_block_end(css: str, i: int) -> int:
+    """'{' 다음 위치부터 짝이 맞는 '}' 위치를 찾음 (주석, 문자열, 중첩 블록 고려)"""
+    depth = 1
+    size = len(css)
+    while i < size:
+        ch = css[i]
+        if ch == '/' and css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = size if end == -1 else end + 2
+            continue
+        if ch in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return size
+
+
+def _strip_comments(prelude: str) -> str:
+    return re.sub(r'/\*.*?\*/', '', prelude, flags=re.S).strip()
+
+
+@dataclass
+class PurgeStats:
+    rules_kept: int = 0
+    rules_removed: int = 0
+    selectors_removed: int = 0
+
+
+def _purge_blocks(blocks, matcher: SelectorMatcher, stats: PurgeStats) -> list:
+    output = []
+    for prelude, body in blocks:
+        prelude = _strip_comments(prelude)
+        if body is None:
+            output.append(f"{prelude};")
+            continue
+
+        if prelude.startswith('@'):
+            if prelude.lower().startswith(NESTED_AT_RULES):
+                inner, _ = _parse_blocks(body)
+                kept = _purge_blocks(inner, matcher, stats)
+                if kept:
+                    output.append(f"{prelude}{{{''.join(kept)}}}")
+            else:
+                output.append(f"{prelude}{{{body}}}")
+            continue
+
+        selectors = [s.strip() for s in _split_top_level(prelude, ',')]
+        kept = [s for s in selectors if s and matcher.matches(s)]
+        stats.selectors_removed += len(selectors) - len(kept)
+        if kept:
+            stats.rules_kept += 1
+            output.append(f"{','.join(kept)}{{{body}}}")
+        else:
+            stats.rules_removed += 1
+    return output
+
+
+def purge_css(css: str, index: HtmlIndex, matcher: SelectorMatcher = None):
+    """인덱스에 없는 선택자를 제거한 CSS 와 통계를 반환
+
+    여러 CSS 파일을 처리할 때는 같은 matcher 를 넘기면 선택자 판정 캐시를 공유합니다.
+    """
+    matcher = matcher or SelectorMatcher(index)
+    stats = PurgeStats()
+    blocks, _ = _parse_blocks(css)
+    return '\n'.join(_purge_blocks(blocks, matcher, stats)), stats
@@ -0,0 +1,134 @@
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pathlib import Path
+from urllib.parse import quote
+import anyio
+
+# file_id 는 한 번 만들어지면 내용이 바뀌지 않으므로 1년 + immutable 로 캐시 허용
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+def content_disposition(filename: str) -> str:
+    """다운로드 파일명 헤더 (한글 등 비 ASCII 이름은 RFC 5987 형식)"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def etag_matches(header_value: str, etag: str) -> bool:
+    """If-None-Match 값 중 하나라도 etag 와 같으면 True (약한 비교, W/ 무시)"""
+    if header_value.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in header_value.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """If-None-Match / If-Modified-Since 조건을 만족하면 True (304 응답 대상)
+
+    If-None-Match 가 있으면 If-Modified-Since 는 무시합니다 (RFC 9110).
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+def parse_range(range_header: str, size: int):
+    """단일 bytes 범위 파싱
+
+    Returns:
+        (start, end) - 끝 포함
+        None         - 범위 요청으로 처리하지 않음 (형식 오류, 여러 범위)
+        ()           - 만족할 수 없는 범위 (416)
+    """
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    start_text, dash, end_text = spec.strip().partition('-')
+    if not dash:
+        return None
+    try:
+        if start_text == '':
+            # 마지막 N 바이트 (bytes=-500)
+            length = int(end_text)
+            if length <= 0:
+                return ()
+            return (max(size - length, 0), size - 1) if size else ()
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return ()
+    return start, min(end, size - 1)
+
+
+async def iter_file_range(path: Path, start: int, end: int):
+    """파일의 [start, end] 구간을 청크 단위로 읽기"""
+    async with await anyio.open_file(path, 'rb') as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def conditional_file_response(request: Request, path: Path, filename: str, media_type: str,
+                              etag: str = None, headers: dict = None) -> Response:
+    """ETag/Last-Modified 조건부 요청(304)과 Range 요청(206/416)을 처리하는 파일 응답"""
+    stat = path.stat()
+    headers = dict(headers or {})
+    headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    headers['Last-Modified'] = formatdate(stat.st_mtime, usegmt=True)
+    headers['Accept-Ranges'] = 'bytes'
+    if etag:
+        headers['ETag'] = etag
+
+    if is_not_modified(request, etag, stat.st_mtime):
+        headers.pop('Content-Encoding', None)
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    # If-Range 가 현재 ETag 와 다르면 범위를 무시하고 전체 전송
+    if range_header and (if_range is None or if_range.strip() == etag):
+        byte_range = parse_range(range_header, stat.st_size)
+        if byte_range == ():
+            headers['Content-Range'] = f"bytes */{stat.st_size}"
+            headers.pop('Content-Encoding', None)
+            return Response(status_code=416, headers=headers)
+        if byte_range is not None:
+            start, end = byte_range
+            headers['Content-Range'] = f"bytes {start}-{end}/{stat.st_size}"
+            headers['Content-Length'] = str(end - start + 1)
+            headers['Content-Disposition'] = content_disposition(filename)
+            return StreamingResponse(
+                iter_file_range(path, start, end),
+                status_code=206,
+                media_type=media_type,
+                headers=headers
+            )
+
+    return FileResponse(
+        path=path,
+        filename=filename,
+        media_type=media_type,
+        headers=headers,
+        stat_result=stat
+    )
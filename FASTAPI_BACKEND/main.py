@@ -1,29 +1,72 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Request
 from fastapi.templating import Jinja2Templates
 from contextlib import asynccontextmanager
-import rjsmin
+import asyncio
+import hashlib
 import os
 import uuid
-from pathlib import Path
-import shutil
+from pathlib import Path, PurePosixPath
+import json
+import time
+import zipfile
+from fastapi.responses import Response
+from starlette.routing import Match
+from http_cache import conditional_file_response
+from artifact_store import (create_artifact_index, remove_expired_files, delete_artifact_files,
+                            variant_path, source_map_path)
+from minify_cache import MinifyCache, CacheEntry
+from minify_engine import MinifyEngine, EngineBusyError
+from metrics import MetricsRegistry, BYTES_BUCKETS
 
 # 임시 파일 저장 디렉토리
 UPLOAD_DIR = Path("uploads")
 MINIFIED_DIR = Path("minified")
 
+# 콘텐츠 해시 캐시 한도 (항목 수 / 압축 파일 총 바이트)
+CACHE_MAX_ENTRIES = int(os.getenv("MINIFY_CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("MINIFY_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# minify 워커 프로세스 수 (0 이면 CPU 코어 수) / 동시에 받을 수 있는 최대 작업 수 (0 이면 워커 수 x 4)
+MINIFY_WORKERS = int(os.getenv("MINIFY_WORKERS", "0"))
+MINIFY_MAX_PENDING = int(os.getenv("MINIFY_MAX_PENDING", "0"))
+
+# 이 크기 이상의 업로드는 스트리밍 모드로 처리 (디스크 스풀 + 워커에서 파일을 읽어 압축)
+STREAM_THRESHOLD = int(os.getenv("MINIFY_STREAM_THRESHOLD", str(8 * 1024 * 1024)))
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# /minify/batch 한 요청에서 받을 수 있는 원본 JS 총 크기 (zip 은 압축 해제 기준)
+BATCH_MAX_BYTES = int(os.getenv("MINIFY_BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# 압축 결과 인덱스 (여러 워커가 공유) / 보관 기간(초) / 만료 파일 정리 주기(초)
+ARTIFACT_INDEX_URL = os.getenv("ARTIFACT_INDEX_URL", "sqlite:///artifacts.db")
+ARTIFACT_TTL = int(os.getenv("ARTIFACT_TTL", str(24 * 60 * 60)))
+ARTIFACT_SWEEP_INTERVAL = int(os.getenv("ARTIFACT_SWEEP_INTERVAL", "60"))
+
+
+async def sweep_expired_artifacts():
+    """만료된 압축 결과를 주기적으로 인덱스와 MINIFIED_DIR 에서 삭제"""
+    while True:
+        await asyncio.sleep(ARTIFACT_SWEEP_INTERVAL)
+        try:
+            removed = await asyncio.to_thread(remove_expired_files, artifact_index)
+            if removed:
+                print(f"만료된 파일 {removed}개 삭제")
+        except Exception as e:
+            print(f"만료 파일 정리 중 오류 발생: {e}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 시작 시: 디렉토리 생성
     UPLOAD_DIR.mkdir(exist_ok=True)
     MINIFIED_DIR.mkdir(exist_ok=True)
+    minify_engine.start()
+    sweeper = asyncio.create_task(sweep_expired_artifacts())
     yield
-    # 종료 시: 임시 파일 정리 (선택사항)
-    if UPLOAD_DIR.exists():
-        shutil.rmtree(UPLOAD_DIR)
-    if MINIFIED_DIR.exists():
-        shutil.rmtree(MINIFIED_DIR)
+    # 종료 시: 다른 워커가 같은 디렉토리와 인덱스를 쓰고 있을 수 있으므로
+    # 파일은 지우지 않고 만료 정리(스위퍼)에 맡김
+    sweeper.cancel()
+    minify_engine.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -31,8 +74,64 @@ app = FastAPI(lifespan=lifespan)
 # 템플릿 설정
 templates = Jinja2Templates(directory="templates")
 
-# 파일 매핑 저장 (실제 프로덕션에서는 DB 사용)
-file_mappings = {}
+# file_id → 압축 결과 파일 매핑 (기본: SQLite, 워커 간 공유)
+artifact_index = create_artifact_index(ARTIFACT_INDEX_URL, ARTIFACT_TTL)
+
+# 동일한 내용의 재업로드 시 기존 결과를 재사용하기 위한 캐시
+minify_cache = MinifyCache(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES)
+
+# 이벤트 루프를 막지 않도록 rjsmin 을 별도 프로세스에서 실행
+minify_engine = MinifyEngine(max_workers=MINIFY_WORKERS, max_pending=MINIFY_MAX_PENDING)
+
+# /metrics 로 내보내는 지표 (uvicorn 워커 프로세스마다 따로 집계)
+metrics = MetricsRegistry()
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    'http_request_duration_seconds', '요청 처리 시간 (응답 헤더 전송까지)', labelnames=('method', 'route'))
+HTTP_REQUESTS = metrics.counter(
+    'http_requests_total', '요청 수', labelnames=('method', 'route', 'status'))
+MINIFY_STAGE_SECONDS = metrics.histogram(
+    'minify_stage_duration_seconds', 'minify 단계별 시간 (read: 업로드 읽기, minify: 압축, write: 파일 기록)',
+    labelnames=('kind', 'stage'))
+MINIFY_CPU_SECONDS = metrics.histogram(
+    'minify_cpu_seconds', '워커 프로세스의 압축 CPU 시간', labelnames=('kind',))
+MINIFY_INPUT_BYTES = metrics.histogram(
+    'minify_input_bytes', '압축 전 크기', buckets=BYTES_BUCKETS, labelnames=('kind',))
+MINIFY_OUTPUT_BYTES = metrics.histogram(
+    'minify_output_bytes', '압축 후 크기', buckets=BYTES_BUCKETS, labelnames=('kind',))
+MINIFY_ERRORS = metrics.counter(
+    'minify_errors_total', '오류 종류별 발생 횟수', labelnames=('type',))
+
+
+def route_label(scope) -> str:
+    """지표 라벨용 경로 템플릿 (/download/{file_id}). 경로 값이 라벨 수를 늘리지 않도록 함"""
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return 'unmatched'
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    route = route_label(request.scope)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method, route=route)
+        HTTP_REQUESTS.inc(method=request.method, route=route, status=status_code)
+
+
+def observe_minify(kind: str, original_size: int, result: dict):
+    """워커가 반환한 단계별 시간과 입출력 크기를 지표에 기록"""
+    MINIFY_STAGE_SECONDS.observe(result['minify_seconds'], kind=kind, stage='minify')
+    MINIFY_STAGE_SECONDS.observe(result['write_seconds'], kind=kind, stage='write')
+    MINIFY_CPU_SECONDS.observe(result['cpu_seconds'], kind=kind)
+    MINIFY_INPUT_BYTES.observe(original_size, kind=kind)
+    MINIFY_OUTPUT_BYTES.observe(result['minified_size'], kind=kind)
 
 
 @app.get("/")
@@ -41,78 +140,599 @@ async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+def compression_ratio(original_size: int, minified_size: int) -> float:
+    """압축률(%) 계산. 빈 파일은 0으로 처리"""
+    if original_size == 0:
+        return 0.0
+    return round((1 - minified_size / original_size) * 100, 2)
+
+
+def register_artifact(cache_key: str, file_id: str, path: Path, filename: str,
+                      original_size: int, result: dict, media_type: str = 'application/javascript'):
+    """압축 결과(워커가 반환한 메타데이터)를 다운로드 인덱스와 캐시에 등록"""
+    artifact_index.put(
+        file_id, path, filename,
+        media_type=media_type,
+        content_hash=cache_key,
+        original_size=original_size,
+        minified_size=result['minified_size'],
+        digest=result['digest'],
+        encodings=result['encodings'],
+        has_source_map=result.get('source_map', False)
+    )
+    
+    # 한도 초과로 캐시에서 제거된 파일과 매핑도 정리
+    evicted = minify_cache.put(
+        cache_key,
+        CacheEntry(file_id, path, original_size, result['minified_size'], last_used=time.time())
+    )
+    for entry in evicted:
+        evict_artifact(entry)
+
+
+def evict_artifact(entry: CacheEntry) -> bool:
+    """캐시에서 밀려난 항목의 인덱스 레코드와 파일 삭제. 삭제했으면 True
+
+    캐시에서는 이미 빠졌으므로 이 프로세스에서는 더 이상 재사용되지 않습니다.
+    다만 이 프로세스가 마지막으로 사용한 뒤 다른 워커가 같은 결과를 재사용해
+    보관 기간을 연장(touch)했다면, 그 워커가 돌려준 file_id 가 아직 다운로드될 수
+    있으므로 지우지 않고 만료 정리(스위퍼)에 맡깁니다.
+    """
+    record = artifact_index.get(entry.file_id)
+    if record is not None and record['expires_at'] - ARTIFACT_TTL > entry.last_used:
+        return False
+    artifact_index.delete(entry.file_id)
+    delete_artifact_files(entry.path)
+    return True
+
+
+def minify_response(file_id: str, original_filename: str, minified_filename: str,
+                    original_size: int, minified_size: int, cached: bool,
+                    source_map: bool = False) -> dict:
+    response = {
+        'success': True,
+        'file_id': file_id,
+        'original_filename': original_filename,
+        'minified_filename': minified_filename,
+        'original_size': original_size,
+        'minified_size': minified_size,
+        'compression_ratio': compression_ratio(original_size, minified_size),
+        'cached': cached
+    }
+    if source_map:
+        response['source_map_url'] = f"/download/{file_id}/map"
+    return response
+
+
+def load_shared_artifact(cache_key: str):
+    """다른 워커가 같은 내용으로 만든 결과를 인덱스에서 조회"""
+    record = artifact_index.find_by_hash(cache_key)
+    if record is None:
+        return None
+    return CacheEntry(record['file_id'], record['path'],
+                      record['original_size'], record['minified_size'])
+
+
+def artifact_cache_key(content_hash: str, source_map: bool) -> str:
+    """source map 포함 여부가 다른 결과는 별도 항목으로 캐시"""
+    return f"{content_hash}+map" if source_map else content_hash
+
+
+def cached_artifact(cache_key: str):
+    """캐시에 있고 아직 만료되지 않은 항목이면 보관 기간을 연장하고 반환"""
+    cached = minify_cache.get(cache_key, loader=load_shared_artifact)
+    if cached is None or artifact_index.get(cached.file_id) is None:
+        return None
+    artifact_index.touch(cached.file_id)
+    # touch 뒤에 기록해야 이후의 touch 를 다른 워커의 재사용으로 구분할 수 있음
+    cached.last_used = time.time()
+    return cached
+
+
+async def spool_upload(file: UploadFile, dest: Path):
+    """업로드를 STREAM_CHUNK_SIZE 단위로 디스크에 기록하면서 SHA-256 을 계산
+
+    Returns:
+        (해시, 원본 크기)
+    """
+    started = time.perf_counter()
+    digest = hashlib.sha256()
+    size = 0
+    with open(dest, 'wb') as f:
+        while chunk := await file.read(STREAM_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+            await asyncio.to_thread(f.write, chunk)
+    MINIFY_STAGE_SECONDS.observe(time.perf_counter() - started, kind='js', stage='read')
+    return digest.hexdigest(), size
+
+
+async def minify_buffered(file: UploadFile, minified_filename: str, source_map: bool = False) -> dict:
+    """업로드 전체를 메모리에 읽어서 압축 (작은 파일용)"""
+    started = time.perf_counter()
+    content = await file.read()
+    MINIFY_STAGE_SECONDS.observe(time.perf_counter() - started, kind='js', stage='read')
+    original_size = len(content)
+    
+    # 동일한 내용이 이미 압축되어 있으면 기존 결과 재사용
+    content_hash = await asyncio.to_thread(MinifyCache.content_key, content)
+    cache_key = artifact_cache_key(content_hash, source_map)
+    cached = cached_artifact(cache_key)
+    if cached is not None:
+        return minify_response(cached.file_id, file.filename, minified_filename,
+                               original_size, cached.minified_size, cached=True, source_map=source_map)
+    
+    # JavaScript Minify + 파일/사전 압축본(+ source map) 저장 (워커 프로세스에서 실행)
+    file_id = str(uuid.uuid4())
+    minified_path = MINIFIED_DIR / f"{file_id}.min.js"
+    if source_map:
+        result = await minify_engine.minify_to_file(content, str(minified_path),
+                                                    file.filename, minified_filename)
+    else:
+        result = await minify_engine.minify_to_file(content, str(minified_path))
+    
+    observe_minify('js', original_size, result)
+    register_artifact(cache_key, file_id, minified_path, minified_filename,
+                      original_size, result)
+    return minify_response(file_id, file.filename, minified_filename,
+                           original_size, result['minified_size'], cached=False, source_map=source_map)
+
+
+async def minify_streaming(file: UploadFile, minified_filename: str, source_map: bool = False) -> dict:
+    """업로드를 디스크에 스풀한 뒤 워커가 파일에서 파일로 압축 (대용량 파일용)
+
+    API 프로세스는 청크 하나(STREAM_CHUNK_SIZE)만 메모리에 유지합니다.
+    """
+    file_id = str(uuid.uuid4())
+    spool_path = UPLOAD_DIR / f"{file_id}.js"
+    try:
+        content_hash, original_size = await spool_upload(file, spool_path)
+        cache_key = artifact_cache_key(content_hash, source_map)
+        
+        cached = cached_artifact(cache_key)
+        if cached is not None:
+            return minify_response(cached.file_id, file.filename, minified_filename,
+                                   original_size, cached.minified_size, cached=True, source_map=source_map)
+        
+        minified_path = MINIFIED_DIR / f"{file_id}.min.js"
+        if source_map:
+            result = await minify_engine.minify_file(
+                str(spool_path), str(minified_path), STREAM_CHUNK_SIZE, file.filename, minified_filename
+            )
+        else:
+            result = await minify_engine.minify_file(
+                str(spool_path), str(minified_path), STREAM_CHUNK_SIZE
+            )
+    finally:
+        await asyncio.to_thread(spool_path.unlink, missing_ok=True)
+    
+    observe_minify('js', original_size, result)
+    register_artifact(cache_key, file_id, minified_path, minified_filename,
+                      original_size, result)
+    return minify_response(file_id, file.filename, minified_filename,
+                           original_size, result['minified_size'], cached=False, source_map=source_map)
+
+
 @app.post("/minify")
-async def minify_js(file: UploadFile = File(...)):
-    """JS 파일을 업로드받아 minify 처리"""
+async def minify_js(file: UploadFile = File(...), stream: bool = False, source_map: bool = False):
+    """JS 파일을 업로드받아 minify 처리
+
+    stream=true 이거나 파일이 STREAM_THRESHOLD 이상이면 스트리밍 모드로 처리합니다.
+    source_map=true 이면 같은 워커 작업에서 source map 을 함께 만들어
+    /download/{file_id}/map 으로 제공합니다.
+    """
     
     # 파일 확장자 검증
     if not file.filename.endswith('.js'):
+        MINIFY_ERRORS.inc(type='invalid_extension')
         raise HTTPException(status_code=400, detail="JavaScript 파일만 업로드 가능합니다.")
     
+    # 압축된 파일명 생성
+    original_name = Path(file.filename).stem
+    minified_filename = f"{original_name}.min.js"
+    
     try:
-        # 원본 파일 읽기
+        if stream or (file.size or 0) >= STREAM_THRESHOLD:
+            return await minify_streaming(file, minified_filename, source_map)
+        return await minify_buffered(file, minified_filename, source_map)
+        
+    except EngineBusyError:
+        MINIFY_ERRORS.inc(type='busy')
+        raise HTTPException(
+            status_code=503,
+            detail="압축 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"}
+        )
+    except UnicodeDecodeError:
+        MINIFY_ERRORS.inc(type='encoding')
+        raise HTTPException(status_code=400, detail="파일 인코딩 오류. UTF-8 형식의 파일을 업로드해주세요.")
+    except Exception as e:
+        MINIFY_ERRORS.inc(type='internal')
+        raise HTTPException(status_code=500, detail=f"압축 중 오류 발생: {str(e)}")
+
+
+@app.post("/minify/css")
+async def minify_css(file: UploadFile = File(...)):
+    """CSS 파일을 업로드받아 rcssmin 으로 minify 처리 (응답 형식은 /minify 와 동일)"""
+    
+    if not file.filename.endswith('.css'):
+        MINIFY_ERRORS.inc(type='invalid_extension')
+        raise HTTPException(status_code=400, detail="CSS 파일만 업로드 가능합니다.")
+    
+    minified_filename = f"{Path(file.filename).stem}.min.css"
+    
+    try:
+        started = time.perf_counter()
         content = await file.read()
-        original_content = content.decode('utf-8')
+        MINIFY_STAGE_SECONDS.observe(time.perf_counter() - started, kind='css', stage='read')
         original_size = len(content)
         
-        # JavaScript Minify
-        minified_content = rjsmin.jsmin(original_content)
-        minified_size = len(minified_content.encode('utf-8'))
+        # 같은 바이트의 JS 결과와 섞이지 않도록 CSS 는 별도 키로 캐시
+        content_hash = await asyncio.to_thread(MinifyCache.content_key, content)
+        cache_key = f"{content_hash}+css"
+        cached = cached_artifact(cache_key)
+        if cached is not None:
+            return minify_response(cached.file_id, file.filename, minified_filename,
+                                   original_size, cached.minified_size, cached=True)
         
-        # 고유 ID 생성
         file_id = str(uuid.uuid4())
+        minified_path = MINIFIED_DIR / f"{file_id}.min.css"
+        result = await minify_engine.minify_css_to_file(content, str(minified_path))
         
-        # 압축된 파일명 생성
-        original_name = Path(file.filename).stem
-        minified_filename = f"{original_name}.min.js"
+        observe_minify('css', original_size, result)
+        register_artifact(cache_key, file_id, minified_path, minified_filename,
+                          original_size, result, media_type='text/css')
+        return minify_response(file_id, file.filename, minified_filename,
+                               original_size, result['minified_size'], cached=False)
         
-        # 압축된 파일 저장
-        minified_path = MINIFIED_DIR / f"{file_id}.min.js"
-        with open(minified_path, 'w', encoding='utf-8') as f:
-            f.write(minified_content)
+    except EngineBusyError:
+        MINIFY_ERRORS.inc(type='busy')
+        raise HTTPException(
+            status_code=503,
+            detail="압축 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"}
+        )
+    except UnicodeDecodeError:
+        MINIFY_ERRORS.inc(type='encoding')
+        raise HTTPException(status_code=400, detail="파일 인코딩 오류. UTF-8 형식의 파일을 업로드해주세요.")
+    except Exception as e:
+        MINIFY_ERRORS.inc(type='internal')
+        raise HTTPException(status_code=500, detail=f"압축 중 오류 발생: {str(e)}")
+
+
+@app.post("/purge")
+async def purge_unused_css(css_files: list[UploadFile] = File(...),
+                           html_files: list[UploadFile] = File(...),
+                           safelist: str = Form('')):
+    """CSS 파일들에서 HTML 페이지들에 쓰이지 않는 선택자를 제거하고 압축하여 CSS 하나로 반환
+
+    safelist: 스크립트로만 붙는 상태 클래스 등 HTML 에 없어도 유지할 이름 (쉼표 구분, 예: "on,.is-open,#layer")
+    """
+    
+    for upload in css_files:
+        if not upload.filename.endswith('.css'):
+            MINIFY_ERRORS.inc(type='invalid_extension')
+            raise HTTPException(status_code=400, detail=f"CSS 파일만 업로드 가능합니다: {upload.filename}")
+    for upload in html_files:
+        if not upload.filename.endswith(('.html', '.htm')):
+            MINIFY_ERRORS.inc(type='invalid_extension')
+            raise HTTPException(status_code=400, detail=f"HTML 파일만 업로드 가능합니다: {upload.filename}")
+    
+    try:
+        started = time.perf_counter()
+        css_contents = [await upload.read() for upload in css_files]
+        html_contents = [await upload.read() for upload in html_files]
+        MINIFY_STAGE_SECONDS.observe(time.perf_counter() - started, kind='purge', stage='read')
+        original_size = sum(len(content) for content in css_contents)
         
-        # 파일 매핑 저장
-        file_mappings[file_id] = {
-            'path': minified_path,
-            'filename': minified_filename
-        }
+        file_id = str(uuid.uuid4())
+        purged_path = MINIFIED_DIR / f"{file_id}.min.css"
+        result = await minify_engine.purge_css_to_file(
+            css_contents, html_contents, safelist.split(','), str(purged_path)
+        )
+        
+        observe_minify('purge', original_size, result)
+        purged_filename = 'purged.min.css'
+        artifact_index.put(
+            file_id, purged_path, purged_filename,
+            media_type='text/css',
+            original_size=original_size,
+            minified_size=result['minified_size'],
+            digest=result['digest'],
+            encodings=result['encodings']
+        )
         
         return {
             'success': True,
             'file_id': file_id,
-            'original_filename': file.filename,
-            'minified_filename': minified_filename,
+            'minified_filename': purged_filename,
+            'css_files': [upload.filename for upload in css_files],
+            'html_files': [upload.filename for upload in html_files],
             'original_size': original_size,
-            'minified_size': minified_size,
-            'compression_ratio': round((1 - minified_size / original_size) * 100, 2)
+            'purged_size': result['purged_size'],
+            'minified_size': result['minified_size'],
+            'compression_ratio': compression_ratio(original_size, result['minified_size']),
+            'rules_kept': result['rules_kept'],
+            'rules_removed': result['rules_removed'],
+            'selectors_removed': result['selectors_removed']
         }
         
+    except EngineBusyError:
+        MINIFY_ERRORS.inc(type='busy')
+        raise HTTPException(
+            status_code=503,
+            detail="압축 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"}
+        )
     except UnicodeDecodeError:
+        MINIFY_ERRORS.inc(type='encoding')
         raise HTTPException(status_code=400, detail="파일 인코딩 오류. UTF-8 형식의 파일을 업로드해주세요.")
     except Exception as e:
+        MINIFY_ERRORS.inc(type='internal')
+        raise HTTPException(status_code=500, detail=f"압축 중 오류 발생: {str(e)}")
+
+
+def batch_entry_name(filename: str) -> str:
+    """zip 내부 경로로 쓸 안전한 이름 (.. 및 절대 경로 제거)"""
+    parts = [p for p in PurePosixPath(filename.replace('\\', '/')).parts if p not in ('', '.', '..', '/')]
+    return '/'.join(parts) or 'unnamed.js'
+
+
+def read_zip_items(fileobj) -> list:
+    """업로드된 zip 에서 .js 항목만 (이름, 내용) 목록으로 추출"""
+    items = []
+    total_size = 0
+    with zipfile.ZipFile(fileobj) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.endswith('.js') or info.filename.startswith('__MACOSX/'):
+                continue
+            total_size += info.file_size
+            if total_size > BATCH_MAX_BYTES:
+                raise ValueError("압축 해제 크기가 허용 한도를 초과했습니다.")
+            items.append((batch_entry_name(info.filename), archive.read(info)))
+    return items
+
+
+async def collect_batch_items(files: list) -> list:
+    """업로드 목록(JS 여러 개 또는 zip 하나)을 (이름, 내용) 목록으로 변환"""
+    if len(files) == 1 and files[0].filename.endswith('.zip'):
+        return await asyncio.to_thread(read_zip_items, files[0].file)
+    
+    items = []
+    total_size = 0
+    for upload in files:
+        if not upload.filename.endswith('.js'):
+            raise ValueError(f"JavaScript 파일만 업로드 가능합니다: {upload.filename}")
+        content = await upload.read()
+        total_size += len(content)
+        if total_size > BATCH_MAX_BYTES:
+            raise ValueError("업로드 크기가 허용 한도를 초과했습니다.")
+        items.append((batch_entry_name(upload.filename), content))
+    return items
+
+
+def write_bundle(path: Path, entries: list, manifest: dict) -> str:
+    """압축 결과와 manifest.json 을 zip 하나로 저장하고 zip 파일의 SHA-256 을 반환"""
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+        for arcname, data in entries:
+            bundle.writestr(arcname, data)
+        bundle.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+    
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(STREAM_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@app.post("/minify/batch")
+async def minify_batch_files(files: list[UploadFile] = File(...)):
+    """여러 JS 파일 또는 zip 하나를 받아 병렬로 minify 한 뒤 zip 하나로 묶어 반환"""
+    
+    try:
+        started = time.perf_counter()
+        items = await collect_batch_items(files)
+        MINIFY_STAGE_SECONDS.observe(time.perf_counter() - started, kind='batch', stage='read')
+        if not items:
+            raise HTTPException(status_code=400, detail="압축할 JavaScript 파일이 없습니다.")
+        
+        # 묶음은 워커별 CPU 시간을 따로 받지 않으므로 전체 경과 시간만 기록
+        started = time.perf_counter()
+        results = await minify_engine.minify_many([content for _, content in items])
+        MINIFY_STAGE_SECONDS.observe(time.perf_counter() - started, kind='batch', stage='minify')
+        
+        # 파일별 결과 manifest 와 zip 항목 구성
+        entries = []
+        used_names = set()
+        manifest_files = []
+        for (name, content), (minified, error) in zip(items, results):
+            record = {
+                'filename': name,
+                'original_size': len(content),
+            }
+            if error is not None:
+                record['error'] = error
+                MINIFY_ERRORS.inc(type='encoding')
+            else:
+                # 같은 이름의 파일이 여러 개면 번호를 붙여 구분
+                stem = name[:-len('.js')]
+                minified_name = f"{stem}.min.js"
+                suffix = 1
+                while minified_name in used_names:
+                    minified_name = f"{stem}-{suffix}.min.js"
+                    suffix += 1
+                used_names.add(minified_name)
+                entries.append((minified_name, minified))
+                MINIFY_INPUT_BYTES.observe(len(content), kind='batch')
+                MINIFY_OUTPUT_BYTES.observe(len(minified), kind='batch')
+                record.update({
+                    'minified_filename': minified_name,
+                    'minified_size': len(minified),
+                    'compression_ratio': compression_ratio(len(content), len(minified)),
+                })
+            manifest_files.append(record)
+        
+        original_total = sum(r['original_size'] for r in manifest_files if 'error' not in r)
+        minified_total = sum(r['minified_size'] for r in manifest_files if 'error' not in r)
+        manifest = {
+            'file_count': len(entries),
+            'failed_count': len(manifest_files) - len(entries),
+            'original_size': original_total,
+            'minified_size': minified_total,
+            'compression_ratio': compression_ratio(original_total, minified_total),
+            'files': manifest_files,
+        }
+        
+        # zip 저장 후 기존 다운로드 흐름(artifact_index)에 등록
+        file_id = str(uuid.uuid4())
+        bundle_path = MINIFIED_DIR / f"{file_id}.zip"
+        started = time.perf_counter()
+        bundle_digest = await asyncio.to_thread(write_bundle, bundle_path, entries, manifest)
+        MINIFY_STAGE_SECONDS.observe(time.perf_counter() - started, kind='batch', stage='write')
+        artifact_index.put(
+            file_id, bundle_path, 'minified_bundle.zip',
+            media_type='application/zip',
+            original_size=original_total,
+            minified_size=minified_total,
+            digest=bundle_digest
+        )
+        
+        return {
+            'success': True,
+            'file_id': file_id,
+            'bundle_filename': 'minified_bundle.zip',
+            **manifest
+        }
+        
+    except HTTPException:
+        raise
+    except EngineBusyError:
+        MINIFY_ERRORS.inc(type='busy')
+        raise HTTPException(
+            status_code=503,
+            detail="압축 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"}
+        )
+    except zipfile.BadZipFile:
+        MINIFY_ERRORS.inc(type='bad_zip')
+        raise HTTPException(status_code=400, detail="올바른 zip 파일이 아닙니다.")
+    except ValueError as e:
+        MINIFY_ERRORS.inc(type='invalid_request')
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        MINIFY_ERRORS.inc(type='internal')
         raise HTTPException(status_code=500, detail=f"압축 중 오류 발생: {str(e)}")
 
 
+def choose_encoding(accept_encoding: str, available: list):
+    """Accept-Encoding 헤더와 보유한 압축본 중 전송할 인코딩 선택 (br 우선)
+
+    q=0 으로 거부된 인코딩은 제외하고, 없으면 None (원본 전송)
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    
+    candidates = []
+    for preference, encoding in enumerate(('br', 'gzip')):
+        if encoding not in available:
+            continue
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > 0:
+            candidates.append((-quality, preference, encoding))
+    return min(candidates)[2] if candidates else None
+
+
 @app.get("/download/{file_id}")
-async def download_file(file_id: str):
-    """압축된 파일 다운로드"""
+async def download_file(file_id: str, request: Request):
+    """압축된 파일 다운로드
+
+    Accept-Encoding 에 따라 미리 만들어 둔 .br / .gz 파일을 그대로 전송합니다.
+    If-None-Match / If-Modified-Since (304) 와 Range (206) 요청을 지원합니다.
+    """
     
-    if file_id not in file_mappings:
+    file_info = artifact_index.get(file_id)
+    if file_info is None:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
-    file_info = file_mappings[file_id]
     file_path = file_info['path']
     
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="파일이 삭제되었습니다.")
     
-    return FileResponse(
-        path=file_path,
+    headers = {}
+    if file_info['has_source_map']:
+        headers['SourceMap'] = f"/download/{file_id}/map"
+    etag = file_info['digest']
+    if file_info['encodings']:
+        headers['Vary'] = 'Accept-Encoding'
+        encoding = choose_encoding(request.headers.get('accept-encoding', ''), file_info['encodings'])
+        if encoding is not None and variant_path(file_path, encoding).exists():
+            file_path = variant_path(file_path, encoding)
+            headers['Content-Encoding'] = encoding
+            etag = f"{etag}-{encoding}"
+    
+    # Content-Length 는 전송하는 파일(압축본) 크기로 설정됨
+    return conditional_file_response(
+        request,
+        file_path,
         filename=file_info['filename'],
-        media_type='application/javascript'
+        media_type=file_info['media_type'],
+        etag=f'"{etag}"' if etag else None,
+        headers=headers
     )
 
 
+@app.get("/download/{file_id}/map")
+async def download_source_map(file_id: str, request: Request):
+    """압축된 파일의 source map 다운로드 (source_map=true 로 압축한 경우에만 존재)"""
+    
+    file_info = artifact_index.get(file_id)
+    if file_info is None or not file_info['has_source_map']:
+        raise HTTPException(status_code=404, detail="source map 을 찾을 수 없습니다.")
+    
+    map_path = source_map_path(file_info['path'])
+    if not map_path.exists():
+        raise HTTPException(status_code=404, detail="파일이 삭제되었습니다.")
+    
+    return conditional_file_response(
+        request,
+        map_path,
+        filename=f"{file_info['filename']}.map",
+        media_type='application/json',
+        etag=f'"{file_info["digest"]}-map"' if file_info['digest'] else None
+    )
+
+
+@app.get("/metrics")
+async def export_metrics():
+    """Prometheus 텍스트 형식 지표"""
+    return Response(content=metrics.render(), media_type=MetricsRegistry.CONTENT_TYPE)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """minify 캐시 적중/미스 통계"""
+    return minify_cache.stats()
+
+
+@app.get("/engine/stats")
+async def engine_stats():
+    """minify 워커 풀 상태 (워커 수, 대기 작업 수, 거절 횟수)"""
+    return minify_engine.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+
+
+@dataclass
+class CacheEntry:
+    """캐시에 보관되는 minify 결과 정보"""
+    file_id: str
+    path: Path
+    original_size: int
+    minified_size: int
+    # 이 프로세스에서 마지막으로 등록/재사용한 시각 (공유 인덱스의 touch 시각과 비교용)
+    last_used: float = 0.0
+
+
+class MinifyCache:
+    """원본 내용의 SHA-256 해시를 키로 하는 minify 결과 LRU 캐시
+
+    - 메모리: 최대 max_entries 개의 항목만 인덱스에 유지
+    - 디스크: 캐시된 압축 파일 크기 합계가 max_bytes 를 넘지 않도록 유지
+    한도를 넘으면 가장 오래 사용되지 않은 항목부터 메모리에서 먼저 제거하며,
+    제거된 항목의 파일 삭제(다른 워커가 사용 중인지 확인 포함)는 호출 측에서 처리합니다.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def content_key(content: bytes) -> str:
+        """원본 바이트의 SHA-256 해시 (캐시 키)"""
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, key: str, loader=None):
+        """캐시 조회. 적중 시 CacheEntry, 아니면 None
+
+        loader 를 주면 이 프로세스의 캐시에 없을 때 loader(key) 로 공유 저장소
+        (다른 워커가 만든 결과)를 조회합니다. 그 결과는 이 캐시에 넣지 않으므로
+        파일 수명은 만든 워커의 캐시와 저장소 만료 시간이 관리합니다.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and not entry.path.exists():
+            # 파일이 외부에서 삭제된 경우 캐시에서도 제거
+            self._remove(key)
+            entry = None
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        if loader is not None:
+            entry = loader(key)
+            if entry is not None and entry.path.exists():
+                self.hits += 1
+                self.shared_hits += 1
+                return entry
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, entry: CacheEntry) -> list:
+        """캐시에 항목 추가. 한도 초과로 제거된 CacheEntry 목록을 반환"""
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.total_bytes += entry.minified_size
+
+        evicted = []
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            old_key = next(iter(self._entries))
+            self.evictions += 1
+            evicted.append(self._remove(old_key))
+        return evicted
+
+    def _remove(self, key: str) -> CacheEntry:
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.minified_size
+        return entry
+
+    def stats(self) -> dict:
+        """캐시 적중/미스 통계"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups * 100, 2) if lookups else 0.0,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'total_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,324 @@
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import codecs
+import gzip
+import hashlib
+import os
+import threading
+import time
+import rcssmin
+import rjsmin
+from artifact_store import ENCODING_SUFFIXES, SOURCE_MAP_SUFFIX
+from sourcemap import build_source_map, dump_source_map
+from css_purge import build_html_index, purge_css, SelectorMatcher
+
+# brotli 는 선택 패키지: 설치되어 있을 때만 .br 사전 압축본을 생성
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = int(os.getenv("MINIFY_BROTLI_QUALITY", "9"))
+
+
+class EngineBusyError(Exception):
+    """minify 대기열이 가득 차서 작업을 받을 수 없을 때 발생"""
+
+
+def minify_source(content: bytes) -> bytes:
+    """워커 프로세스에서 실행: UTF-8 바이트를 받아 minify 결과 바이트를 반환"""
+    return rjsmin.jsmin(content.decode('utf-8')).encode('utf-8')
+
+
+def _timed(func, *args) -> tuple:
+    """func(*args) 의 결과와 경과 시간(초), 이 프로세스가 쓴 CPU 시간(초)을 반환"""
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    value = func(*args)
+    return value, time.perf_counter() - started, time.process_time() - cpu_started
+
+
+def _with_timings(result: dict, minify_seconds: float, cpu_seconds: float) -> dict:
+    result['minify_seconds'] = minify_seconds
+    result['cpu_seconds'] = cpu_seconds
+    return result
+
+
+def write_artifact(minified: bytes, dst_path: str, chunk_size: int = 1024 * 1024) -> dict:
+    """minify 결과와 사전 압축본(.gz, .br)을 기록하고 메타데이터를 반환
+
+    압축본이 원본보다 크면(아주 작은 파일) 만들지 않습니다.
+    Returns:
+        {'minified_size': 결과 크기, 'digest': 결과 SHA-256, 'encodings': 만든 압축본 목록,
+         'write_seconds': 기록(압축본 생성 포함)에 걸린 시간}
+    """
+    started = time.perf_counter()
+    view = memoryview(minified)
+    with open(dst_path, 'wb') as dst:
+        for offset in range(0, len(view), chunk_size):
+            dst.write(view[offset:offset + chunk_size])
+
+    variants = {'gzip': lambda: gzip.compress(minified, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        variants['br'] = lambda: brotli.compress(minified, quality=BROTLI_QUALITY)
+
+    encodings = []
+    for encoding, compress in variants.items():
+        compressed = compress()
+        if len(compressed) < len(minified):
+            with open(dst_path + ENCODING_SUFFIXES[encoding], 'wb') as f:
+                f.write(compressed)
+            encodings.append(encoding)
+
+    return {
+        'minified_size': len(minified),
+        'digest': hashlib.sha256(minified).hexdigest(),
+        'encodings': encodings,
+        'write_seconds': time.perf_counter() - started,
+    }
+
+
+def minify_with_source_map(source: str, dst_path: str, source_name: str, minified_name: str) -> dict:
+    """minify 결과와 함께 source map(dst_path + '.map')을 같은 패스에서 기록
+
+    source map 은 원본과 결과 문자열을 비교해 만들기 때문에 str 로 변환한 원본이 필요합니다.
+    """
+    def minify_and_map():
+        minified = rjsmin.jsmin(source)
+        return minified, build_source_map(source, minified, source_name, minified_name)
+
+    (minified, source_map), minify_seconds, cpu_seconds = _timed(minify_and_map)
+    with open(dst_path + SOURCE_MAP_SUFFIX, 'wb') as f:
+        f.write(dump_source_map(source_map))
+
+    result = write_artifact(minified.encode('utf-8'), dst_path)
+    result['source_map'] = True
+    return _with_timings(result, minify_seconds, cpu_seconds)
+
+
+def minify_to_file(content: bytes, dst_path: str, source_name: str = None, minified_name: str = None) -> dict:
+    """워커 프로세스에서 실행: 업로드 바이트를 minify 하여 압축본과 함께 파일로 기록
+
+    source_name 을 주면 source map 도 함께 만듭니다.
+    """
+    if source_name is not None:
+        return minify_with_source_map(content.decode('utf-8'), dst_path, source_name, minified_name)
+    minified, minify_seconds, cpu_seconds = _timed(minify_source, content)
+    return _with_timings(write_artifact(minified, dst_path), minify_seconds, cpu_seconds)
+
+
+def minify_css_to_file(content: bytes, dst_path: str) -> dict:
+    """워커 프로세스에서 실행: CSS 바이트를 rcssmin 으로 압축하여 압축본과 함께 파일로 기록"""
+    content.decode('utf-8')  # 인코딩 오류는 UnicodeDecodeError 로 호출 측에 전달
+    minified, minify_seconds, cpu_seconds = _timed(rcssmin.cssmin, content)
+    return _with_timings(write_artifact(minified, dst_path), minify_seconds, cpu_seconds)
+
+
+def purge_css_to_file(css_contents: list, html_contents: list, safelist: list, dst_path: str) -> dict:
+    """워커 프로세스에서 실행: HTML 에서 쓰이지 않는 선택자를 제거하고 압축하여 파일 하나로 기록
+
+    HTML 들을 한 번만 파싱해 태그/id/class 인덱스를 만들고, 모든 CSS 파일이
+    같은 선택자 판정 캐시를 공유합니다.
+    Returns:
+        write_artifact 결과에 purged_size(압축 전), rules_kept, rules_removed, selectors_removed 추가
+    """
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    index = build_html_index(content.decode('utf-8') for content in html_contents)
+    index.add_safelist(safelist)
+    matcher = SelectorMatcher(index)
+
+    purged_parts = []
+    totals = {'rules_kept': 0, 'rules_removed': 0, 'selectors_removed': 0}
+    for content in css_contents:
+        purged, stats = purge_css(content.decode('utf-8'), index, matcher)
+        purged_parts.append(purged)
+        for key in totals:
+            totals[key] += getattr(stats, key)
+
+    purged = '\n'.join(purged_parts)
+    minified = rcssmin.cssmin(purged).encode('utf-8')
+    minify_seconds = time.perf_counter() - started
+    cpu_seconds = time.process_time() - cpu_started
+
+    result = write_artifact(minified, dst_path)
+    result['purged_size'] = len(purged.encode('utf-8'))
+    result.update(totals)
+    return _with_timings(result, minify_seconds, cpu_seconds)
+
+
+def _validate_utf8(buffer, chunk_size: int):
+    """버퍼 전체를 str 로 만들지 않고 청크 단위로 UTF-8 유효성 검사"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for offset in range(0, len(buffer), chunk_size):
+        decoder.decode(buffer[offset:offset + chunk_size])
+    decoder.decode(b'', final=True)
+
+
+def minify_file(src_path: str, dst_path: str, chunk_size: int = 1024 * 1024,
+                source_name: str = None, minified_name: str = None) -> dict:
+    """워커 프로세스에서 실행: 파일을 읽어 minify 결과와 압축본을 파일로 기록
+
+    rjsmin 은 bytes/str 만 받으므로 원본 파일은 bytes 로 한 번에 모두 읽습니다.
+    청크 단위로 UTF-8 검사를 한 뒤 바이트 그대로 rjsmin 에 넘기고 (str 변환 없음),
+    결과는 chunk_size 단위로 기록합니다.
+    워커의 최대 메모리 사용량은 원본 크기 N 기준 약 2N (원본 바이트 + 결과)에
+    압축본 크기가 더해진 정도입니다.
+    source_name 을 주면 원본을 str 로 읽어 source map 도 함께 만듭니다 (메모리 사용량 증가).
+    """
+    if source_name is not None:
+        with open(src_path, 'r', encoding='utf-8', newline='') as src:
+            return minify_with_source_map(src.read(), dst_path, source_name, minified_name)
+
+    minify_seconds = cpu_seconds = 0.0
+    with open(src_path, 'rb') as src:
+        content = src.read()
+    if content:
+        _validate_utf8(content, chunk_size)
+        minified, minify_seconds, cpu_seconds = _timed(rjsmin.jsmin, content)
+        del content
+    else:
+        minified = b''
+
+    return _with_timings(write_artifact(minified, dst_path, chunk_size), minify_seconds, cpu_seconds)
+
+
+def minify_batch(items: list) -> list:
+    """워커 프로세스에서 실행: [(index, bytes), ...] 를 차례로 minify
+
+    파일 하나의 인코딩 오류가 묶음 전체를 실패시키지 않도록 오류는 결과에 담아 반환합니다.
+    Returns:
+        [(index, 결과 바이트 또는 None, 오류 메시지 또는 None), ...]
+    """
+    results = []
+    for index, content in items:
+        try:
+            results.append((index, minify_source(content), None))
+        except UnicodeDecodeError:
+            results.append((index, None, "UTF-8 인코딩 오류"))
+    return results
+
+
+class MinifyEngine:
+    """ProcessPoolExecutor 기반 minify 엔진
+
+    rjsmin 은 CPU 를 오래 점유하므로 이벤트 루프가 아닌 별도 프로세스에서 실행합니다.
+    실행 중 + 대기 중인 작업 수가 max_pending 에 도달하면 EngineBusyError 를 발생시켜
+    호출 측에서 503 으로 응답하도록 합니다. 자리는 제출 전에 예약하고, 요청이 취소되어도
+    워커의 작업이 실제로 끝나거나 취소될 때 반환합니다.
+    """
+
+    def __init__(self, max_workers: int = None, max_pending: int = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self._executor = None
+        self._pending = 0
+        # 완료 콜백은 executor 의 관리 스레드에서 호출되므로 카운터를 잠금으로 보호
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _reserve(self, count: int = 1):
+        """count 개의 자리를 한 번에 예약. 한도를 넘으면 아무것도 예약하지 않고 EngineBusyError"""
+        if self._executor is None:
+            raise RuntimeError("MinifyEngine 이 시작되지 않았습니다.")
+        with self._lock:
+            if self._pending + count > self.max_pending:
+                self.rejected += 1
+                raise EngineBusyError(f"대기 중인 작업이 {self._pending}개로 한도를 초과했습니다.")
+            self._pending += count
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, func, *args):
+        """예약한 자리 하나로 작업을 제출하고 awaitable 을 반환
+
+        자리는 워커 쪽 future 의 완료 콜백에서 반환하므로, 기다리던 요청이 취소되어
+        작업이 계속 실행되는 동안에는 한도에 그대로 포함됩니다.
+        """
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return asyncio.wrap_future(future)
+
+    async def run(self, func, *args):
+        """func(*args) 를 워커 프로세스에서 실행하고 결과를 기다림"""
+        self._reserve()
+        return await self._submit(func, *args)
+
+    async def minify_to_file(self, content: bytes, dst_path: str,
+                             source_name: str = None, minified_name: str = None) -> dict:
+        return await self.run(minify_to_file, content, dst_path, source_name, minified_name)
+
+    async def minify_file(self, src_path: str, dst_path: str, chunk_size: int = 1024 * 1024,
+                          source_name: str = None, minified_name: str = None) -> dict:
+        return await self.run(minify_file, src_path, dst_path, chunk_size, source_name, minified_name)
+
+    async def minify_css_to_file(self, content: bytes, dst_path: str) -> dict:
+        return await self.run(minify_css_to_file, content, dst_path)
+
+    async def purge_css_to_file(self, css_contents: list, html_contents: list,
+                                safelist: list, dst_path: str) -> dict:
+        return await self.run(purge_css_to_file, css_contents, html_contents, safelist, dst_path)
+
+    async def minify_many(self, contents: list) -> list:
+        """여러 파일을 워커 수만큼의 묶음으로 나눠 병렬 minify
+
+        파일마다 작업을 제출하면 대기열 한도를 금방 넘기므로, 크기 기준으로
+        고르게 나눈 묶음 단위로 제출합니다.
+        Returns:
+            입력 순서대로 [(결과 바이트 또는 None, 오류 메시지 또는 None), ...]
+        """
+        group_count = min(self.max_workers, len(contents))
+        if group_count == 0:
+            return []
+        # 묶음 전체의 자리를 한 번에 예약하여 다른 요청과 한도를 두고 경쟁하지 않도록 함
+        self._reserve(group_count)
+
+        # 큰 파일부터 가장 가벼운 묶음에 배정
+        groups = [[] for _ in range(group_count)]
+        loads = [0] * group_count
+        order = sorted(range(len(contents)), key=lambda i: len(contents[i]), reverse=True)
+        for index in order:
+            target = loads.index(min(loads))
+            groups[target].append((index, contents[index]))
+            loads[target] += len(contents[index])
+
+        futures = []
+        try:
+            for group in groups:
+                futures.append(self._submit(minify_batch, group))
+        except BaseException:
+            # 제출하지 못한 묶음의 예약 반환 (실패한 묶음은 _submit 에서 반환)
+            for _ in range(group_count - len(futures) - 1):
+                self._release()
+            raise
+        group_results = await asyncio.gather(*futures)
+
+        results = [None] * len(contents)
+        for group_result in group_results:
+            for index, minified, error in group_result:
+                results[index] = (minified, error)
+        return results
+
+    def stats(self) -> dict:
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': self._pending,
+            'rejected': self.rejected,
+        }
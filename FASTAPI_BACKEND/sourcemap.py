@@ -0,0 +1,193 @@
+import json
+import re
+
+BASE64_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+# rjsmin 이 제거하거나 공백 1개로 줄이는 문자 (제어 문자와 공백, \x00-\x20)
+WHITESPACE = frozenset(chr(code) for code in range(0x21))
+
+# 이 문자 뒤의 '/' 는 나눗셈이 아니라 정규식 리터럴의 시작 (rjsmin 과 같은 규칙)
+REGEX_PRECEDERS = frozenset('(,=:[!&|?{};+*-\n')
+
+REGEX_METHOD_FOLLOWS = re.compile(r'[\x00-\x20]*\.[\x00-\x20]*[a-z]')
+
+# rjsmin 이 그대로 보존하는 리터럴 패턴 (따옴표 문자열은 한 줄 안에서 닫혀야 함)
+LITERAL_PATTERNS = {
+    "'": re.compile(r"'[^'\\\r\n]*(?:\\(?:[^\r\n]|\r?\n|\r)[^'\\\r\n]*)*'"),
+    '"': re.compile(r'"[^"\\\r\n]*(?:\\(?:[^\r\n]|\r?\n|\r)[^"\\\r\n]*)*"'),
+    '`': re.compile(r'`[^`\\]*(?:\\(?:[^\r\n]|\r?\n|\r)[^`\\]*)*`'),
+    '/': re.compile(
+        r'/(?![\r\n/*])[^/\\\[\r\n]*'
+        r'(?:(?:\\[^\r\n]|\[[^\\\]\r\n]*(?:\\[^\r\n][^\\\]\r\n]*)*\])[^/\\\[\r\n]*)*/[a-z]*'
+    ),
+}
+
+
+def encode_vlq(value: int) -> str:
+    """source map 용 Base64 VLQ 인코딩"""
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    encoded = ''
+    while True:
+        digit = value & 0b11111
+        value >>= 5
+        if value:
+            digit |= 0b100000
+        encoded += BASE64_CHARS[digit]
+        if not value:
+            return encoded
+
+
+def _is_ident(ch: str) -> bool:
+    return ch.isalnum() or ch in '_$' or ord(ch) > 127
+
+
+class _SourceCursor:
+    """원본 문자열 위치와 (줄, 열)을 함께 추적"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.index = 0
+        self.line = 0
+        self.column = 0
+
+    def move_to(self, target: int):
+        source = self.source
+        last_newline = source.rfind('\n', self.index, target)
+        if last_newline == -1:
+            segment = source[self.index:target]
+        else:
+            self.line += source.count('\n', self.index, target)
+            self.column = 0
+            segment = source[last_newline + 1:target]
+        self.column += len(segment) + sum(1 for ch in segment if ord(ch) > 0xFFFF)
+        self.index = target
+
+    def skip_removable(self) -> bool:
+        """rjsmin 이 지우는 공백/주석을 건너뜀. 건너뛴 것이 있으면 True"""
+        source = self.source
+        size = len(source)
+        start = self.index
+        i = start
+        while i < size:
+            ch = source[i]
+            if ch in WHITESPACE:
+                i += 1
+            elif ch == '/' and source.startswith('//', i):
+                end = source.find('\n', i)
+                i = size if end == -1 else end
+            elif ch == '/' and source.startswith('/*', i):
+                end = source.find('*/', i + 2)
+                i = size if end == -1 else end + 2
+            else:
+                break
+        if i != start:
+            self.move_to(i)
+        return i != start
+
+
+def build_source_map(source: str, minified: str, source_name: str, file_name: str) -> dict:
+    """rjsmin 결과와 원본을 한 번 훑어 토큰 단위 source map (v3) 을 생성
+
+    rjsmin 은 공백과 주석만 제거하고(필요한 곳은 공백 1개 / 줄바꿈으로 대체) 나머지 문자는
+    순서대로 그대로 두므로, 결과 문자를 원본에 맞춰 가며 각 토큰의 시작 위치를 기록합니다.
+    문자열/템플릿/정규식 리터럴은 rjsmin 과 같은 패턴으로 찾아 한 번에 건너뜁니다.
+    예상치 못한 불일치가 생기면 그 지점까지의 매핑만 남깁니다.
+    """
+    cursor = _SourceCursor(source)
+    size = len(source)
+
+    lines = []
+    segments = []
+    generated_column = 0
+    previous = {'generated_column': 0, 'line': 0, 'column': 0}
+
+    last_significant = '\n'  # 마지막으로 출력한 공백이 아닌 문자 (파일 시작은 줄바꿈으로 취급)
+    last_output = '\n'
+    recent_word = ''
+
+    def add_segment():
+        segment = (
+            encode_vlq(generated_column - previous['generated_column'])
+            + encode_vlq(0)
+            + encode_vlq(cursor.line - previous['line'])
+            + encode_vlq(cursor.column - previous['column'])
+        )
+        previous.update(generated_column=generated_column, line=cursor.line, column=cursor.column)
+        segments.append(segment)
+
+    def new_line():
+        nonlocal segments, generated_column
+        lines.append(','.join(segments))
+        segments = []
+        generated_column = 0
+        previous['generated_column'] = 0
+
+    position = 0
+    length = len(minified)
+    while position < length:
+        ch = minified[position]
+        skipped = cursor.skip_removable()
+
+        if ch in WHITESPACE:
+            # 결과의 공백/줄바꿈은 원본 공백(또는 주석)을 대신한 문자
+            if ch == '\n':
+                new_line()
+            else:
+                generated_column += 1
+            last_output = ch
+            position += 1
+            continue
+
+        if cursor.index >= size or source[cursor.index] != ch:
+            break
+
+        # 리터럴이면 통째로 하나의 토큰으로 처리 (rjsmin 처럼 원본 기준으로 판별)
+        literal = None
+        if ch in '\'"`':
+            literal = LITERAL_PATTERNS[ch].match(source, cursor.index)
+        elif ch == '/' and (last_significant in REGEX_PRECEDERS or recent_word == 'return'):
+            literal = LITERAL_PATTERNS['/'].match(source, cursor.index)
+        elif ch == '/' and last_significant == ')':
+            # ')' 뒤는 /.../.test( 처럼 메서드 호출이 이어질 때만 정규식
+            literal = LITERAL_PATTERNS['/'].match(source, cursor.index)
+            if literal and not REGEX_METHOD_FOLLOWS.match(source, literal.end()):
+                literal = None
+
+        token = literal.group() if literal else ch
+        if literal and not minified.startswith(token, position):
+            break
+
+        if skipped or literal or generated_column == 0 or not (_is_ident(ch) and _is_ident(last_output)):
+            add_segment()
+
+        cursor.move_to(cursor.index + len(token))
+        if '\n' in token:
+            # 여러 줄에 걸친 리터럴 (템플릿 문자열 등)
+            for _ in range(token.count('\n')):
+                new_line()
+            tail = token[token.rfind('\n') + 1:]
+        else:
+            tail = token
+        generated_column += len(tail) + sum(1 for c in tail if ord(c) > 0xFFFF)
+
+        if literal:
+            recent_word = ''
+        else:
+            recent_word = recent_word + ch if _is_ident(ch) else ''
+        last_significant = token[-1]
+        last_output = token[-1]
+        position += len(token)
+
+    lines.append(','.join(segments))
+    return {
+        'version': 3,
+        'file': file_name,
+        'sources': [source_name],
+        'sourcesContent': [source],
+        'names': [],
+        'mappings': ';'.join(lines),
+    }
+
+
+def dump_source_map(source_map: dict) -> bytes:
+    return json.dumps(source_map, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,35 @@
+import os
+import sys
+
+# FASTAPI_BACKEND 를 sys.path 에 추가하여 css_purge 모듈을 임포트할 수 있도록 합니다.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from css_purge import HtmlIndex, purge_css
+
+
+def kept_selectors(css, index):
+    purged, _ = purge_css(css, index)
+    return [rule.split('{', 1)[0] for rule in purged.split('\n') if rule]
+
+
+def test_quoted_attribute_values_are_not_combinators():
+    """속성 값 안의 공백이나 >+~ 를 결합자로 보고 사용 중인 규칙을 지우지 않는지 확인합니다."""
+    index = HtmlIndex(tags={'a', 'div'}, attributes={'title', 'data-x'})
+    css = 'a[title="x y"]{color:red}[data-x="a>b"]{color:blue}div > a{margin:0}[data-x="a~span"]{top:0}'
+
+    assert kept_selectors(css, index) == ['a[title="x y"]', '[data-x="a>b"]', 'div > a', '[data-x="a~span"]']
+
+
+def test_pseudo_class_arguments_do_not_restrict_matching():
+    """:not(a b) 안의 이름은 문서에 없어도 선택자를 남기는지 확인합니다."""
+    index = HtmlIndex(tags={'div'})
+    css = 'div:not(a b){color:red}div:not(:is(span p)){color:blue}span div{color:green}'
+
+    assert kept_selectors(css, index) == ['div:not(a b)', 'div:not(:is(span p))']
+
+
+def test_unused_names_are_still_removed():
+    index = HtmlIndex(tags={'a'}, attributes={'title'})
+    css = 'a[title="x y"] span{color:red}[data-x="a>b"]{color:blue}'
+
+    assert kept_selectors(css, index) == []
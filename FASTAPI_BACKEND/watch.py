@@ -0,0 +1,206 @@
+"""JS 디렉토리 감시 + 증분 minify
+
+디렉토리의 .js 파일을 감시하다가 내용(SHA-256)이 바뀐 파일만 다시 압축하여
+*.min.js 트리와 manifest 를 최신 상태로 유지합니다.
+
+사용 예:
+    python watch.py ../sExam/CMS/GNB/js                  # 같은 폴더에 module.min.js 등을 생성하고 감시
+    python watch.py ../sExam/CMS/GNB/js --out dist --once # 한 번만 빌드
+"""
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import os
+import time
+from minify_engine import minify_source
+
+# watchfiles 는 선택 패키지 (uvicorn[standard] 에 포함): 없으면 주기적으로 폴링
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+MANIFEST_NAME = 'minify-manifest.json'
+
+
+def min_name(relative_path: str) -> str:
+    """module.js → module.min.js"""
+    return relative_path[:-len('.js')] + '.min.js'
+
+
+def scan_sources(src_dir: Path, out_dir: Path) -> dict:
+    """src_dir 아래의 원본 .js 파일 {상대 경로(/ 구분): os.stat_result}. *.min.js 와 out_dir 은 제외"""
+    sources = {}
+    pending = [src_dir]
+    out_dir = out_dir.resolve()
+    while pending:
+        directory = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    path = Path(entry.path)
+                    if path.resolve() != out_dir and not entry.name.startswith('.'):
+                        pending.append(path)
+                elif entry.name.endswith('.js') and not entry.name.endswith('.min.js'):
+                    relative = Path(entry.path).relative_to(src_dir).as_posix()
+                    sources[relative] = entry.stat()
+    return sources
+
+
+def write_atomic(path: Path, data: bytes):
+    """임시 파일에 쓴 뒤 교체하여, 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 함"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+class IncrementalMinifier:
+    """manifest 를 기준으로 바뀐 파일만 다시 압축
+
+    manifest 항목: {hash, size, mtime_ns, minified, minified_size}
+    크기와 수정 시각이 같으면 파일을 읽지 않고, 다르면 해시를 비교해 내용이 바뀐 경우에만 압축합니다.
+    압축에 실패한 파일은 minified 가 None, error 에 사유를 기록하고 이전 결과를 지워
+    오래된 .min.js 가 최신처럼 남지 않게 하며, 내용이 바뀔 때까지 다시 시도하지 않습니다.
+    """
+
+    def __init__(self, src_dir: Path, out_dir: Path):
+        self.src_dir = src_dir
+        self.out_dir = out_dir
+        self.manifest_path = out_dir / MANIFEST_NAME
+        self.files = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        manifest = {
+            'source_dir': str(self.src_dir),
+            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'files': dict(sorted(self.files.items())),
+        }
+        write_atomic(self.manifest_path,
+                     json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def build(self) -> dict:
+        """한 번의 증분 빌드. 처리 결과 개수를 반환"""
+        started = time.perf_counter()
+        counts = {'minified': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+        changed = False
+        sources = scan_sources(self.src_dir, self.out_dir)
+
+        for relative, stat in sources.items():
+            record = self.files.get(relative)
+            minified_path = self.out_dir / min_name(relative)
+            # 실패로 기록된 파일은 결과 파일 없이도 최신 상태
+            up_to_date = record is not None and (record.get('error') or minified_path.exists())
+            if (up_to_date and record['size'] == stat.st_size
+                    and record['mtime_ns'] == stat.st_mtime_ns):
+                counts['unchanged'] += 1
+                continue
+
+            content = (self.src_dir / relative).read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if up_to_date and record['hash'] == digest:
+                # touch 등으로 수정 시각만 바뀐 경우
+                record.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                counts['unchanged'] += 1
+                changed = True
+                continue
+
+            try:
+                minified = minify_source(content)
+            except UnicodeDecodeError:
+                print(f"UTF-8 인코딩 오류로 건너뜀 (내용이 바뀌면 다시 시도): {relative}")
+                # 이전 결과는 더 이상 원본과 맞지 않으므로 삭제
+                minified_path.unlink(missing_ok=True)
+                self.files[relative] = {
+                    'hash': digest,
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'minified': None,
+                    'minified_size': 0,
+                    'error': 'UTF-8 인코딩 오류',
+                }
+                counts['failed'] += 1
+                changed = True
+                continue
+            write_atomic(minified_path, minified)
+            self.files[relative] = {
+                'hash': digest,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'minified': min_name(relative),
+                'minified_size': len(minified),
+            }
+            counts['minified'] += 1
+            changed = True
+
+        # 원본이 삭제된 파일의 결과 정리
+        for relative in [r for r in self.files if r not in sources]:
+            minified = self.files.pop(relative)['minified']
+            if minified:
+                (self.out_dir / minified).unlink(missing_ok=True)
+            counts['removed'] += 1
+            changed = True
+
+        if changed:
+            self._save_manifest()
+        counts['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return counts
+
+
+def report(counts: dict):
+    print(f"압축 {counts['minified']}개, 변경 없음 {counts['unchanged']}개, "
+          f"삭제 {counts['removed']}개, 실패 {counts['failed']}개 ({counts['elapsed_ms']}ms)")
+
+
+def watch(minifier: IncrementalMinifier, interval: float):
+    """변경이 생길 때마다 증분 빌드 (Ctrl+C 로 종료)"""
+    print(f"감시 중: {minifier.src_dir} → {minifier.out_dir}")
+    if watchfiles is not None:
+        # 결과 파일(*.min.js, manifest) 변경은 다시 빌드를 일으키지 않도록 제외
+        def is_source(change, path):
+            return path.endswith('.js') and not path.endswith('.min.js')
+
+        for _ in watchfiles.watch(minifier.src_dir, watch_filter=is_source):
+            report(minifier.build())
+        return
+
+    while True:
+        time.sleep(interval)
+        counts = minifier.build()
+        if counts['minified'] or counts['removed'] or counts['failed']:
+            report(counts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JS 디렉토리 감시 + 증분 minify")
+    parser.add_argument('src', help="감시할 JS 디렉토리")
+    parser.add_argument('--out', help="*.min.js 와 manifest 를 둘 디렉토리 (기본: src 와 같은 위치)")
+    parser.add_argument('--once', action='store_true', help="한 번만 빌드하고 종료")
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help="watchfiles 가 없을 때 폴링 주기(초) (기본: 0.5)")
+    args = parser.parse_args(argv)
+
+    src_dir = Path(args.src).resolve()
+    if not src_dir.is_dir():
+        raise SystemExit(f"디렉토리를 찾을 수 없습니다: {args.src}")
+    out_dir = Path(args.out).resolve() if args.out else src_dir
+
+    minifier = IncrementalMinifier(src_dir, out_dir)
+    report(minifier.build())
+    if not args.once:
+        try:
+            watch(minifier, args.interval)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Benchmark /{lang}/gnb/gnb.json handlers in-process
+
+Compares, for the same lang and gnb.json:
+  legacy - the original handler, copied verbatim from the baseline mainv2.py: path probing +
+           open + json.load + the per-node localize (translation dicts rebuilt per title) + JSONResponse
+  memory - mainv2 route localizing once and serving bytes from memory
+  static - mainv2 route serving the prebuilt files written by build_gnb.py
+
+Requests are driven straight through the ASGI app (no sockets), so the numbers
+are handler cost only. Run build_gnb.py first (or pass --build).
+
+Usage:
+    python bench_gnb.py --lang en --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+import mainv2
+from build_gnb import build
+
+
+# The original handler on its own app, so every variant goes through the same ASGI stack
+legacy_app = FastAPI()
+
+
+@legacy_app.api_route("/{lang}/gnb/gnb.json", methods=["GET", "POST"])
+async def legacy_gnb_json(lang: str):
+    """gnb.json handler as it was before caching (baseline mainv2.py, unchanged)"""
+    paths_to_check = [
+        os.path.join(mainv2.CURRENT_DIR, "templates", "gnb.json"),
+        os.path.join(mainv2.CURRENT_DIR, "gnb.json")
+    ]
+    json_path = None
+    for path in paths_to_check:
+        if os.path.exists(path):
+            json_path = path
+            break
+
+    if not json_path:
+        return JSONResponse({"error": "gnb.json not found"}, status_code=404)
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        gnb_data = json.load(f)
+
+    # Recursively localize menuId, url, and title based on path lang parameter
+    def localize(obj):
+        if isinstance(obj, dict):
+            new_obj = {}
+            for k, v in obj.items():
+                if k == "menuId" and isinstance(v, str):
+                    new_obj[k] = v.replace("gkr", f"g{lang}")
+                elif k == "url" and isinstance(v, str):
+                    new_obj[k] = v.replace("/kr/", f"/{lang}/")
+                elif k == "title" and isinstance(v, str) and lang != "kr":
+                    translations = {
+                        "디지털 & IT 서비스": "Digital & IT Services",
+                        "클라우드 & 인프라": "Cloud & Infrastructure",
+                        "오퍼링": "Offerings",
+                        "데이터센터/네트워크": "Data Center/Network",
+                        "데이터센터": "Data Center",
+                        "데이터센터 설계/구축/이전": "Data Center Design/Build/Migration",
+                        "데이터센터 운영": "Data Center Operation",
+                        "네트워크": "Network",
+                        "국내/해외 데이터 통신 서비스": "Domestic/Global Network Services",
+                        "네트워크 설계/구축": "Network Design/Build"
+                    }
+                    new_obj[k] = translations.get(v, v)
+                elif k == "gnb_title" and isinstance(v, str) and lang != "kr":
+                    translations = {
+                        "클라우드 & 인프라": "Cloud & Infrastructure"
+                    }
+                    new_obj[k] = translations.get(v, v)
+                else:
+                    new_obj[k] = localize(v)
+            return new_obj
+        elif isinstance(obj, list):
+            return [localize(item) for item in obj]
+        else:
+            return obj
+
+    localized_data = localize(gnb_data)
+    return JSONResponse(content=localized_data)
+
+
+async def call_app(app, path, accept_encoding):
+    """Send one GET through the ASGI app and return (status, body size)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("127.0.0.1", 8000), "client": ("127.0.0.1", 50000),
+        "headers": [(b"host", b"127.0.0.1"), (b"accept-encoding", accept_encoding.encode())],
+    }
+    result = {"status": None, "size": 0}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            result["size"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return result["status"], result["size"]
+
+
+async def measure(name, call, requests):
+    status, size = await call()  # warm-up (fills caches)
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        status, size = await call()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "handler": name,
+        "status": status,
+        "bytes": size,
+        "mean_us": round(statistics.fmean(timings) * 1e6, 1),
+        "p50_us": round(timings[len(timings) // 2] * 1e6, 1),
+        "p99_us": round(timings[int(len(timings) * 0.99) - 1] * 1e6, 1),
+        "rps": round(len(timings) / sum(timings)),
+    }
+
+
+async def run(lang, requests, accept_encoding):
+    path = f"/{lang}/gnb/gnb.json"
+    static_manifest = mainv2.GNB_STATIC_MANIFEST
+    if mainv2.get_gnb_static_file(mainv2.load_gnb_source(), lang) is None:
+        raise SystemExit(f"No up-to-date static build for '{lang}': run build_gnb.py or pass --build")
+
+    results = [await measure("legacy", lambda: call_app(legacy_app, path, accept_encoding), requests)]
+    # Hide the static build so the route takes the in-memory path
+    mainv2.GNB_STATIC_MANIFEST = static_manifest + ".disabled"
+    try:
+        results.append(await measure("memory", lambda: call_app(mainv2.app, path, accept_encoding), requests))
+    finally:
+        mainv2.GNB_STATIC_MANIFEST = static_manifest
+    results.append(await measure("static", lambda: call_app(mainv2.app, path, accept_encoding), requests))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark gnb.json handlers")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--accept-encoding", default="gzip, deflate, br",
+                        help="Accept-Encoding sent to the mainv2 route (legacy never compresses)")
+    parser.add_argument("--build", action="store_true", help="Run build_gnb.py for --lang first")
+    args = parser.parse_args(argv)
+
+    if args.build:
+        build([args.lang])
+    results = asyncio.run(run(args.lang, args.requests, args.accept_encoding))
+
+    print(f"{'handler':<8} {'status':>6} {'bytes':>7} {'mean(us)':>9} {'p50(us)':>8} {'p99(us)':>8} {'req/s':>8}")
+    for r in results:
+        print(f"{r['handler']:<8} {r['status']:>6} {r['bytes']:>7} {r['mean_us']:>9} "
+              f"{r['p50_us']:>8} {r['p99_us']:>8} {r['rps']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Build static, precompressed /{lang}/gnb/gnb.json files for mainv2.py
+
+Writes dist/{lang}/gnb/gnb.json with .gz (and .br when brotli is installed)
+next to it for every configured language, then dist/gnb-manifest.json.
+mainv2.py serves these files directly while the manifest matches the current
+gnb.json and falls back to localizing on the fly otherwise.
+
+Usage:
+    python build_gnb.py                 # languages from GNB_LANGUAGES (default: kr,en)
+    python build_gnb.py --lang kr en cn
+Rebuilding some languages keeps the others in the manifest while gnb.json is unchanged.
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+
+from mainv2 import (
+    ENCODING_SUFFIXES, GNB_LANGUAGES, GNB_STATIC_DIR, GNB_STATIC_MANIFEST,
+    gnb_etag, load_gnb_source, missing_translations, render_gnb_json,
+)
+
+# brotli is optional: without it only the .gz variant is written
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def write_atomic(path, data):
+    """Write to a temp file and swap it in so the server never reads a half-written file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def previous_languages(manifest_path, source_digest):
+    """Languages of an existing manifest built from the same gnb.json ({} when stale or missing)"""
+    try:
+        with open(manifest_path, "rb") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if previous.get("source_digest") != source_digest:
+        return {}
+    return previous.get("languages") or {}
+
+
+def build(languages, out_dir=GNB_STATIC_DIR, manifest_path=GNB_STATIC_MANIFEST):
+    """Build every language and return the manifest (written last, so it never points at missing files).
+    Languages already built from the same gnb.json stay in the manifest, so building a subset
+    does not drop the others"""
+    source = load_gnb_source()
+    if source is None:
+        raise SystemExit("gnb.json not found")
+
+    manifest = {
+        "source": source.signature[0],
+        "source_digest": source.digest,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "languages": previous_languages(manifest_path, source.digest),
+    }
+    for lang in languages:
+        body = render_gnb_json(source, lang)
+        variants = {None: body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=11)
+
+        file_path = os.path.join(out_dir, lang, "gnb", "gnb.json")
+        for encoding, data in variants.items():
+            write_atomic(file_path + ENCODING_SUFFIXES.get(encoding, ""), data)
+        # Drop a .br left over from a build that had brotli installed
+        for encoding, suffix in ENCODING_SUFFIXES.items():
+            if encoding not in variants and os.path.exists(file_path + suffix):
+                os.remove(file_path + suffix)
+
+        manifest["languages"][lang] = {
+            "etag": gnb_etag(body),
+            "size": len(body),
+            "encodings": sorted(e for e in variants if e is not None),
+        }
+        sizes = ", ".join(f"{e or 'identity'} {len(d)}B" for e, d in variants.items())
+        print(f"{lang}: {sizes}")
+        missing = missing_translations.get(lang)
+        if missing:
+            print(f"  {len(missing)} untranslated string(s): {', '.join(sorted(missing))}")
+
+    write_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build static precompressed gnb.json per language")
+    parser.add_argument("--lang", nargs="+", default=GNB_LANGUAGES,
+                        help=f"Languages to build (default: {' '.join(GNB_LANGUAGES)})")
+    args = parser.parse_args(argv)
+    manifest = build(args.lang)
+    print(f"Built {len(manifest['languages'])} language(s) into {GNB_STATIC_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,31 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, Response
 from fastapi.templating import Jinja2Templates
+from collections import OrderedDict, namedtuple
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+import asyncio
+import gzip
+import hashlib
+import logging
 import os
 import uvicorn
 import json
 
-app = FastAPI()
+# rjsmin is optional: without it bundles are served concatenated but not minified
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+# watchfiles is optional: without it the JS index is refreshed by polling
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+# uvicorn's logger, so background task failures show up in the server output
+logger = logging.getLogger("uvicorn.error")
 
 # Root directory of the project
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -14,36 +34,176 @@ CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 # Configure Jinja2Templates using absolute path to be robust against execution CWD differences
 templates = Jinja2Templates(directory=os.path.join(CURRENT_DIR, "templates"))
 
-# Route to serve javascript files from local directories or parent workspace directory
-@app.get("/js/{filename}")
-async def get_js(filename: str):
-    paths_to_check = [
-        os.path.join(CURRENT_DIR, "templates", "js", filename),
-        os.path.join(CURRENT_DIR, "js", filename),
-        os.path.join(CURRENT_DIR, "templates", filename),
-        os.path.join(BASE_DIR, filename)
-    ]
-    for file_path in paths_to_check:
-        print(f"DEBUG GNB TEST: Checking JS path {file_path} (exists={os.path.exists(file_path)})")
-        if os.path.exists(file_path):
-            return FileResponse(file_path)
-    return JSONResponse({"error": f"File {filename} not found"}, status_code=404)
-
-# Route to serve mock layout header.html
-@app.api_route("/{lang}/layout/header.html", methods=["GET", "POST"])
-async def get_header(lang: str):
-    paths_to_check = [
-        os.path.join(CURRENT_DIR, "templates", "header.html"),
-        os.path.join(CURRENT_DIR, "header.html")
-    ]
-    for html_path in paths_to_check:
-        if os.path.exists(html_path):
-            with open(html_path, "r", encoding="utf-8") as f:
-                html_content = f.read()
-            return HTMLResponse(content=html_content)
-    
-    # Fallback to default mock HTML
-    html_content = """
+# GNB_MODE=prod loads templates and HTML fragments once; dev (default) reloads them when the file changes
+GNB_MODE = os.getenv("GNB_MODE", "dev")
+RELOAD_ON_CHANGE = GNB_MODE != "prod"
+templates.env.auto_reload = RELOAD_ON_CHANGE
+
+# Ordered member files of each JS bundle, served as /bundle/{name}.{hash}.js
+JS_BUNDLES = {
+    # Scripts loaded in <head> before the inline langSet config
+    "gnb-head": ["libs.js", "common_module.js", "module.js"],
+    # Full GNB script set for pages that define their config before the bundle
+    "gnb": ["libs.js", "common_module.js", "module.js", "extension2.js", "ion_common.js", "extension_ko.js"],
+}
+
+# Number of previous builds kept per bundle so pages rendered just before a rebuild still load
+BUNDLE_VERSIONS_KEPT = 3
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+# Directories searched for /js/{filename}, in priority order
+JS_SEARCH_DIRS = [
+    os.path.join(CURRENT_DIR, "templates", "js"),
+    os.path.join(CURRENT_DIR, "js"),
+    os.path.join(CURRENT_DIR, "templates"),
+    BASE_DIR
+]
+
+# Seconds between JS index rescans when watchfiles is not installed (or not watching)
+JS_INDEX_POLL_INTERVAL = 1.0
+
+# Seconds of polling before watching again after the watch failed or had no directory to watch
+JS_INDEX_WATCH_RETRY = 30.0
+
+JsFile = namedtuple("JsFile", ["path", "mtime_ns", "size", "etag"])
+
+
+def build_js_index():
+    """Scan the search directories once and map filename -> JsFile (earlier directories win)"""
+    index = {}
+    for directory in JS_SEARCH_DIRS:
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.name in index or not entry.is_file():
+                continue
+            stat = entry.stat()
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            index[entry.name] = JsFile(entry.path, stat.st_mtime_ns, stat.st_size, etag)
+    return index
+
+
+# filename -> JsFile, replaced as a whole by the watcher so readers never see a partial index
+js_index = build_js_index()
+
+
+async def refresh_js_index():
+    """Rescan into a new js_index; on error keep the previous one so the watcher keeps running"""
+    global js_index
+    try:
+        js_index = await asyncio.to_thread(build_js_index)
+    except Exception:
+        logger.exception("JS index rescan failed, keeping the previous index")
+
+
+async def watch_js_index():
+    """Rebuild js_index whenever a file in a search directory is added, removed or changed.
+    Polls instead while watchfiles is missing, no search directory exists or the watch failed,
+    and tries watching again every JS_INDEX_WATCH_RETRY seconds, so the index never goes stale"""
+    loop = asyncio.get_running_loop()
+    while True:
+        if watchfiles is not None:
+            directories = [d for d in JS_SEARCH_DIRS if os.path.isdir(d)]
+            if not directories:
+                logger.warning("No JS search directory to watch, polling for %ss", JS_INDEX_WATCH_RETRY)
+            else:
+                try:
+                    async for _ in watchfiles.awatch(*directories, recursive=False):
+                        await refresh_js_index()
+                    logger.warning("JS index watch stopped, polling for %ss", JS_INDEX_WATCH_RETRY)
+                except Exception:
+                    logger.exception("JS index watch failed, polling for %ss", JS_INDEX_WATCH_RETRY)
+                # Changes made while the watch was down would otherwise be missed
+                await refresh_js_index()
+
+        deadline = loop.time() + JS_INDEX_WATCH_RETRY if watchfiles is not None else None
+        while deadline is None or loop.time() < deadline:
+            await asyncio.sleep(JS_INDEX_POLL_INTERVAL)
+            await refresh_js_index()
+
+
+def is_not_modified(request, *etags):
+    """True when If-None-Match lists any of `etags` (weak comparison, W/ ignored) or is '*'"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return not candidates.isdisjoint(etags)
+
+
+def content_etag(content):
+    return f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+
+
+def encoded_etag(etag, encoding):
+    """ETag of a compressed variant ("abc" -> "abc-gzip"); identity and gzip are different representations"""
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+def accepted_encodings(accept_encoding):
+    """Accept-Encoding header -> {coding: q-value}; same parsing as FASTAPI_BACKEND's choose_encoding"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+class CachedFile:
+    """First existing file of `candidates`, kept in memory with its ETag.
+    Re-read when it changes in dev mode; never touched again after the first load in prod mode"""
+
+    def __init__(self, *candidates):
+        self.candidates = candidates
+        self.path = None
+        self.signature = None
+        self.content = None
+        self.etag = None
+
+    def get(self):
+        """Return self with path/content/etag up to date, or None if no candidate exists"""
+        if self.content is not None and not RELOAD_ON_CHANGE:
+            return self
+        for path in self.candidates:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signature = (path, stat.st_mtime_ns, stat.st_size)
+            if signature != self.signature:
+                with open(path, "rb") as f:
+                    self.content = f.read()
+                self.path, self.signature, self.etag = path, signature, content_etag(self.content)
+            return self
+        self.path = self.signature = self.content = self.etag = None
+        return None
+
+
+def cached_response(request, content, etag, media_type="text/html; charset=utf-8"):
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+# Mock header served when no header.html exists
+DEFAULT_HEADER_HTML = """
     <div class="gnb">
         <!-- GNB will be rendered here dynamically -->
     </div>
@@ -63,65 +223,478 @@ async def get_header(lang: str):
         <!-- RNB will be rendered here dynamically -->
     </div>
     """
-    return HTMLResponse(content=html_content)
+DEFAULT_HEADER_BYTES = DEFAULT_HEADER_HTML.encode("utf-8")
+DEFAULT_HEADER_ETAG = content_etag(DEFAULT_HEADER_BYTES)
 
-# Route to serve the GNB JSON (5-depth Categories structure)
-@app.api_route("/{lang}/gnb/gnb.json", methods=["GET", "POST"])
-async def get_gnb_json(lang: str):
-    paths_to_check = [
-        os.path.join(CURRENT_DIR, "templates", "gnb.json"),
-        os.path.join(CURRENT_DIR, "gnb.json")
-    ]
-    json_path = None
-    for path in paths_to_check:
-        if os.path.exists(path):
-            json_path = path
-            break
-            
-    if not json_path:
-        return JSONResponse({"error": "gnb.json not found"}, status_code=404)
-        
-    with open(json_path, "r", encoding="utf-8") as f:
-        gnb_data = json.load(f)
-        
-    # Recursively localize menuId, url, and title based on path lang parameter
-    def localize(obj):
-        if isinstance(obj, dict):
+# Index page template (indexv2.html first), header fragment and stylesheet served from memory
+index_page = CachedFile(
+    os.path.join(CURRENT_DIR, "templates", "indexv2.html"),
+    os.path.join(CURRENT_DIR, "templates", "index.html")
+)
+header_fragment = CachedFile(
+    os.path.join(CURRENT_DIR, "templates", "header.html"),
+    os.path.join(CURRENT_DIR, "header.html")
+)
+style_sheet = CachedFile(os.path.join(CURRENT_DIR, "templates", "style.css"))
+
+# Rendered index page: (template signature, bundle URLs) -> (bytes, ETag); only the latest is kept
+rendered_index = {}
+
+
+# Candidate locations of gnb.json, in priority order
+GNB_JSON_PATHS = [
+    os.path.join(CURRENT_DIR, "templates", "gnb.json"),
+    os.path.join(CURRENT_DIR, "gnb.json")
+]
+
+# Max number of languages kept in the localized gnb.json cache (lang comes from the URL)
+GNB_JSON_CACHE_SIZE = 32
+
+# Number of gnb.json versions kept so clients can ask for a delta with ?since=<revision>
+GNB_REVISIONS_KEPT = 5
+
+# Max number of (lang, since, current) patches kept
+GNB_PATCH_CACHE_SIZE = 64
+
+# Per-language translation files: i18n/{lang}.json holds one table per translated key,
+# each mapping a Korean source string to its translation ({"title": {...}, "gnb_title": {...}})
+I18N_DIR = os.path.join(CURRENT_DIR, "i18n")
+
+# Language gnb.json is written in (never translated)
+SOURCE_LANG = "kr"
+
+# Translations used for a lang without its own i18n file
+FALLBACK_LANG = "en"
+
+# gnb.json keys whose string values are translated, each with its own table
+# (gnb_title is the short panel label and is translated separately from title)
+TRANSLATED_KEYS = frozenset(["title", "gnb_title"])
+
+EMPTY_TABLE = MappingProxyType({})
+
+
+def load_translations():
+    """Read every i18n/{lang}.json once into read-only mappings: lang -> key -> {source: translation}"""
+    translations = {}
+    if os.path.isdir(I18N_DIR):
+        for entry in sorted(os.scandir(I18N_DIR), key=lambda e: e.name):
+            if entry.name.endswith(".json") and entry.is_file():
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    tables = json.load(f)
+                translations[entry.name[:-len(".json")]] = MappingProxyType(
+                    {key: MappingProxyType(tables.get(key) or {}) for key in TRANSLATED_KEYS})
+    return MappingProxyType(translations)
+
+
+TRANSLATIONS = load_translations()
+
+# lang -> {untranslated source string: occurrences} from the latest localization of gnb.json
+missing_translations = {}
+
+
+GnbSource = namedtuple("GnbSource", ["signature", "digest", "data"])
+GnbEntry = namedtuple("GnbEntry", ["source_digest", "body", "gzip_body", "etag"])
+
+# Languages built as static files by build_gnb.py (others are localized on the fly)
+GNB_LANGUAGES = [lang.strip() for lang in os.getenv("GNB_LANGUAGES", "kr,en").split(",") if lang.strip()]
+
+# Output of build_gnb.py: {lang}/gnb/gnb.json (+ .gz/.br) and the manifest
+GNB_STATIC_DIR = os.path.join(CURRENT_DIR, "dist")
+GNB_STATIC_MANIFEST = os.path.join(GNB_STATIC_DIR, "gnb-manifest.json")
+
+# File suffix of each precompressed variant
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Parsed gnb.json, re-read only when its (path, mtime, size) changes
+gnb_source = None
+# lang -> GnbEntry with the serialized and gzipped localized JSON (LRU)
+gnb_json_cache = OrderedDict()
+# (manifest mtime/size, parsed manifest) of the static build
+gnb_static_manifest = None
+# (lang, encoding) -> prebuilt file bytes, cleared whenever the manifest changes
+gnb_static_files = {}
+# revision -> parsed gnb.json of the last GNB_REVISIONS_KEPT versions, oldest first
+gnb_revisions = OrderedDict()
+# (lang, since revision, current revision) -> serialized JSON patch (LRU)
+gnb_patch_cache = OrderedDict()
+
+
+def get_translations(lang):
+    """Translation tables for lang, key -> {source: translation} (empty for the source language)"""
+    if lang == SOURCE_LANG:
+        return MappingProxyType({})
+    return TRANSLATIONS.get(lang) or TRANSLATIONS.get(FALLBACK_LANG, MappingProxyType({}))
+
+
+def localize(obj, lang):
+    """Localize menuId, url, and translated keys for lang in a single pass over the tree.
+    Strings without a translation are recorded in missing_translations[lang]"""
+    translations = get_translations(lang)
+    menu_prefix = f"g{lang}"
+    url_prefix = f"/{lang}/"
+    missing = {}
+
+    def walk(node):
+        if isinstance(node, dict):
             new_obj = {}
-            for k, v in obj.items():
-                if k == "menuId" and isinstance(v, str):
-                    new_obj[k] = v.replace("gkr", f"g{lang}")
-                elif k == "url" and isinstance(v, str):
-                    new_obj[k] = v.replace("/kr/", f"/{lang}/")
-                elif k == "title" and isinstance(v, str) and lang != "kr":
-                    translations = {
-                        "디지털 & IT 서비스": "Digital & IT Services",
-                        "클라우드 & 인프라": "Cloud & Infrastructure",
-                        "오퍼링": "Offerings",
-                        "데이터센터/네트워크": "Data Center/Network",
-                        "데이터센터": "Data Center",
-                        "데이터센터 설계/구축/이전": "Data Center Design/Build/Migration",
-                        "데이터센터 운영": "Data Center Operation",
-                        "네트워크": "Network",
-                        "국내/해외 데이터 통신 서비스": "Domestic/Global Network Services",
-                        "네트워크 설계/구축": "Network Design/Build"
-                    }
-                    new_obj[k] = translations.get(v, v)
-                elif k == "gnb_title" and isinstance(v, str) and lang != "kr":
-                    translations = {
-                        "클라우드 & 인프라": "Cloud & Infrastructure"
-                    }
-                    new_obj[k] = translations.get(v, v)
+            for k, v in node.items():
+                if isinstance(v, str):
+                    if k == "menuId":
+                        v = v.replace("gkr", menu_prefix)
+                    elif k == "url":
+                        v = v.replace("/kr/", url_prefix)
+                    elif k in TRANSLATED_KEYS and lang != SOURCE_LANG:
+                        translated = translations.get(k, EMPTY_TABLE).get(v)
+                        if translated is None:
+                            missing[v] = missing.get(v, 0) + 1
+                        else:
+                            v = translated
+                    new_obj[k] = v
                 else:
-                    new_obj[k] = localize(v)
+                    new_obj[k] = walk(v)
             return new_obj
-        elif isinstance(obj, list):
-            return [localize(item) for item in obj]
+        elif isinstance(node, list):
+            return [walk(item) for item in node]
+        else:
+            return node
+
+    result = walk(obj)
+    if lang != SOURCE_LANG:
+        missing_translations[lang] = missing
+    return result
+
+
+def gnb_revision(source):
+    """Short id of a gnb.json version, sent as X-GNB-Revision and accepted by ?since="""
+    return source.digest[:16]
+
+
+def load_gnb_source():
+    """Return the parsed gnb.json, re-reading it only after it changed (None if missing)"""
+    global gnb_source
+    for path in GNB_JSON_PATHS:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature = (path, stat.st_mtime_ns, stat.st_size)
+        if gnb_source is not None and gnb_source.signature == signature:
+            return gnb_source
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if gnb_source is not None and gnb_source.digest == digest:
+            # Only the mtime changed (e.g. touch): keep the localized cache
+            gnb_source = gnb_source._replace(signature=signature)
         else:
-            return obj
+            gnb_source = GnbSource(signature, digest, json.loads(raw))
+            gnb_revisions[gnb_revision(gnb_source)] = gnb_source.data
+            while len(gnb_revisions) > GNB_REVISIONS_KEPT:
+                gnb_revisions.popitem(last=False)
+        return gnb_source
+    return None
+
+
+def render_gnb_json(source, lang):
+    """Localized gnb.json bytes for lang (same bytes for the memory cache and the static build)"""
+    return json.dumps(localize(source.data, lang), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def gnb_etag(body):
+    return content_etag(body)
+
+
+def get_gnb_entry(source, lang):
+    """Serialized + gzipped localized JSON for lang, built once per gnb.json version"""
+    entry = gnb_json_cache.get(lang)
+    if entry is None or entry.source_digest != source.digest:
+        body = render_gnb_json(source, lang)
+        entry = GnbEntry(source.digest, body, gzip.compress(body, mtime=0), gnb_etag(body))
+        gnb_json_cache[lang] = entry
+    gnb_json_cache.move_to_end(lang)
+    while len(gnb_json_cache) > GNB_JSON_CACHE_SIZE:
+        gnb_json_cache.popitem(last=False)
+    return entry
+
+
+def load_gnb_static_manifest():
+    """Return the manifest written by build_gnb.py, re-reading it only after it changed (None if not built)"""
+    global gnb_static_manifest
+    try:
+        stat = os.stat(GNB_STATIC_MANIFEST)
+    except FileNotFoundError:
+        gnb_static_manifest = None
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    if gnb_static_manifest is None or gnb_static_manifest[0] != signature:
+        with open(GNB_STATIC_MANIFEST, "r", encoding="utf-8") as f:
+            gnb_static_manifest = (signature, json.load(f))
+        gnb_static_files.clear()
+    return gnb_static_manifest[1]
+
+
+def read_gnb_static_file(lang, encoding):
+    """Bytes of dist/{lang}/gnb/gnb.json[.gz|.br], read from disk once per build"""
+    key = (lang, encoding)
+    content = gnb_static_files.get(key)
+    if content is None:
+        file_path = os.path.join(GNB_STATIC_DIR, lang, "gnb", "gnb.json") + ENCODING_SUFFIXES.get(encoding, "")
+        with open(file_path, "rb") as f:
+            content = gnb_static_files[key] = f.read()
+    return content
+
+
+def get_gnb_static_file(source, lang):
+    """Manifest entry of the prebuilt gnb.json for lang, or None if lang was not built
+    or the build is older than the current gnb.json"""
+    manifest = load_gnb_static_manifest()
+    if manifest is None or manifest.get("source_digest") != source.digest:
+        return None
+    return manifest["languages"].get(lang)
+
+
+def pointer_token(key):
+    """Escape a key for a JSON pointer (RFC 6901)"""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def json_diff(old, new, path=""):
+    """JSON patch (RFC 6902 add/remove/replace) turning old into new.
+    Lists are trimmed to the changed middle first, so inserting or removing a menu is one op"""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{pointer_token(key)}"})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{pointer_token(key)}", "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, f"{path}/{pointer_token(key)}"))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        start = 0
+        while start < len(old) and start < len(new) and old[start] == new[start]:
+            start += 1
+        old_end, new_end = len(old), len(new)
+        while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+        common = min(old_end, new_end) - start
+        ops = []
+        for i in range(start, start + common):
+            ops.extend(json_diff(old[i], new[i], f"{path}/{i}"))
+        # Remove from the back so earlier indexes stay valid
+        for i in reversed(range(start + common, old_end)):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for i in range(start + common, new_end):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def get_gnb_patch(source, lang, since):
+    """Serialized patch from revision `since` to the current gnb.json for lang.
+    None when `since` is no longer kept or the patch would not be smaller than the full document"""
+    old_data = gnb_revisions.get(since)
+    if old_data is None:
+        return None
+    key = (lang, since, gnb_revision(source))
+    if key not in gnb_patch_cache:
+        patch = json_diff(localize(old_data, lang), localize(source.data, lang))
+        body = json.dumps(patch, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        gnb_patch_cache[key] = body if len(body) < len(render_gnb_json(source, lang)) else None
+    gnb_patch_cache.move_to_end(key)
+    while len(gnb_patch_cache) > GNB_PATCH_CACHE_SIZE:
+        gnb_patch_cache.popitem(last=False)
+    return gnb_patch_cache[key]
+
+
+def pick_encoding(request, encodings):
+    """Best precompressed variant the client accepts: 'br', 'gzip' or None for identity.
+    The highest q-value wins (br on a tie); codings refused with q=0 are never picked"""
+    accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+    candidates = [(accepted.get(encoding, accepted.get("*", 0.0)), -preference, encoding)
+                  for preference, encoding in enumerate(("br", "gzip")) if encoding in encodings]
+    quality, _, encoding = max(candidates, default=(0.0, 0, None))
+    return encoding if quality > 0 else None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for cached_file in (index_page, header_fragment, style_sheet):
+        cached_file.get()
+    watcher = asyncio.create_task(watch_js_index())
+    yield
+    watcher.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+class JsBundle:
+    """Concatenated + minified bundle that is rebuilt only when a member file changes"""
+
+    def __init__(self, name, members):
+        self.name = name
+        self.members = members
+        self.signature = None
+        self.hash = None
+        self.versions = OrderedDict()  # hash -> bundle bytes
+        self.lock = asyncio.Lock()
+
+    def current_signature(self):
+        """(path, mtime, size) of every member from js_index; changes whenever a member is edited"""
+        signature = []
+        for filename in self.members:
+            js_file = js_index.get(filename)
+            if js_file is None:
+                raise FileNotFoundError(f"Bundle member {filename} not found")
+            signature.append((js_file.path, js_file.mtime_ns, js_file.size))
+        return tuple(signature)
+
+    def build(self, signature):
+        parts = []
+        for file_path, _, _ in signature:
+            with open(file_path, "r", encoding="utf-8-sig") as f:
+                source = f.read()
+            parts.append(f"/* {os.path.basename(file_path)} */\n{source}")
+        # ';' guards against members that end without a semicolon
+        content = "\n;\n".join(parts)
+        if rjsmin is not None:
+            content = rjsmin.jsmin(content)
+        return content.encode("utf-8")
+
+    async def refresh(self):
+        """Rebuild if any member changed since the last build and return the current hash"""
+        signature = self.current_signature()
+        if signature == self.signature:
+            return self.hash
+        async with self.lock:
+            if signature != self.signature:
+                content = await asyncio.to_thread(self.build, signature)
+                self.hash = hashlib.sha256(content).hexdigest()[:16]
+                self.versions[self.hash] = content
+                self.versions.move_to_end(self.hash)
+                while len(self.versions) > BUNDLE_VERSIONS_KEPT:
+                    self.versions.popitem(last=False)
+                self.signature = signature
+        return self.hash
+
+
+bundles = {name: JsBundle(name, members) for name, members in JS_BUNDLES.items()}
+
+
+async def bundle_urls():
+    """Hashed URL of every bundle for use in templates, e.g. {{ bundle_urls['gnb-head'] }}"""
+    return {name: f"/bundle/{name}.{await bundle.refresh()}.js" for name, bundle in bundles.items()}
+
+
+# Route to serve a JS bundle: /bundle/{name}.{hash}.js is immutable, /bundle/{name}.js is always current
+@app.get("/bundle/{bundle_file}")
+async def get_bundle(bundle_file: str, request: Request):
+    stem = bundle_file[:-len(".js")] if bundle_file.endswith(".js") else bundle_file
+    name, requested_hash = stem, None
+    if name not in bundles and "." in stem:
+        name, requested_hash = stem.rsplit(".", 1)
+    bundle = bundles.get(name)
+    if bundle is None:
+        return JSONResponse({"error": f"Bundle {bundle_file} not found"}, status_code=404)
+
+    try:
+        current_hash = await bundle.refresh()
+    except FileNotFoundError as e:
+        return JSONResponse({"error": str(e)}, status_code=404)
+
+    content_hash = requested_hash or current_hash
+    content = bundle.versions.get(content_hash)
+    if content is None:
+        return JSONResponse({"error": f"Bundle version {content_hash} not found"}, status_code=404)
+
+    headers = {
+        "ETag": f'"{content_hash}"',
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if requested_hash else "no-cache",
+    }
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/javascript", headers=headers)
+
+
+# Route to serve javascript files from local directories or parent workspace directory
+# (looked up in js_index, so no filesystem probing per request)
+@app.get("/js/{filename}")
+async def get_js(filename: str, request: Request):
+    js_file = js_index.get(filename)
+    if js_file is None:
+        return JSONResponse({"error": f"File {filename} not found"}, status_code=404)
+    # Unhashed URL: browsers may cache but must revalidate with the ETag
+    headers = {"ETag": js_file.etag, "Cache-Control": "no-cache"}
+    if is_not_modified(request, js_file.etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(js_file.path, headers=headers)
+
+# Route to serve mock layout header.html (from memory, see CachedFile)
+@app.api_route("/{lang}/layout/header.html", methods=["GET", "POST"])
+async def get_header(lang: str, request: Request):
+    fragment = header_fragment.get()
+    if fragment is not None:
+        return cached_response(request, fragment.content, fragment.etag)
+    # Fallback to default mock HTML
+    return cached_response(request, DEFAULT_HEADER_BYTES, DEFAULT_HEADER_ETAG)
+
+# Route to serve the GNB JSON (5-depth Categories structure)
+# Languages prebuilt by build_gnb.py are served as-is (a front web server can also serve
+# dist/ directly); any other lang, or a build older than gnb.json, is localized on the fly
+@app.api_route("/{lang}/gnb/gnb.json", methods=["GET", "POST"])
+async def get_gnb_json(lang: str, request: Request, since: str = None):
+    source = load_gnb_source()
+    if source is None:
+        return JSONResponse({"error": "gnb.json not found"}, status_code=404)
+
+    # ?since=<X-GNB-Revision the client holds>: send only the changes when that revision is still kept
+    revision = gnb_revision(source)
+    if since is not None:
+        patch = get_gnb_patch(source, lang, since)
+        if patch is not None:
+            headers = {"X-GNB-Revision": revision, "X-GNB-Base-Revision": since, "Cache-Control": "no-cache"}
+            return Response(content=patch, media_type="application/json-patch+json", headers=headers)
+
+    static_file = get_gnb_static_file(source, lang)
+    if static_file is not None:
+        # Every variant has its own ETag; any of them means the client already holds this version
+        encoding = pick_encoding(request, static_file["encodings"])
+        headers = {"ETag": encoded_etag(static_file["etag"], encoding), "Cache-Control": "no-cache",
+                   "Vary": "Accept-Encoding", "X-GNB-Revision": revision}
+        variant_etags = [encoded_etag(static_file["etag"], e) for e in [None] + static_file["encodings"]]
+        if is_not_modified(request, *variant_etags):
+            return Response(status_code=304, headers=headers)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        content = read_gnb_static_file(lang, encoding)
+        return Response(content=content, media_type="application/json", headers=headers)
+
+    entry = get_gnb_entry(source, lang)
+    gzip_etag = encoded_etag(entry.etag, "gzip")
+    use_gzip = pick_encoding(request, ["gzip"]) == "gzip"
+    headers = {"ETag": gzip_etag if use_gzip else entry.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding",
+               "X-GNB-Revision": revision}
+    # Either validator means the client already holds this version
+    if is_not_modified(request, entry.etag, gzip_etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
-    localized_data = localize(gnb_data)
-    return JSONResponse(content=localized_data)
+# Route to list gnb.json strings that have no translation yet, per language
+@app.get("/i18n/missing")
+async def get_missing_translations():
+    return {
+        lang: dict(sorted(missing.items(), key=lambda item: -item[1]))
+        for lang, missing in sorted(missing_translations.items())
+    }
 
 # Route to serve GNB feature content
 @app.api_route("/{lang}/gnb/feature/feature.html", methods=["GET", "POST"])
@@ -142,18 +715,25 @@ async def get_feature_html(lang: str):
 @app.get("/")
 async def get_index(request: Request):
     # Try indexv2.html first, then index.html
-    for page in ["indexv2.html", "index.html"]:
-        page_path = os.path.join(CURRENT_DIR, "templates", page)
-        if os.path.exists(page_path):
-            return templates.TemplateResponse(page, {"request": request})
-    return HTMLResponse(content="<h3>No index file found in templates/</h3>", status_code=404)
+    page = index_page.get()
+    if page is None:
+        return HTMLResponse(content="<h3>No index file found in templates/</h3>", status_code=404)
+    urls = await bundle_urls()
+    # The page only depends on the template and the bundle URLs, so it is rendered once per change of either
+    key = (page.signature, tuple(sorted(urls.items())))
+    if key not in rendered_index:
+        content = templates.get_template(os.path.basename(page.path)).render(bundle_urls=urls).encode("utf-8")
+        rendered_index.clear()
+        rendered_index[key] = (content, content_etag(content))
+    content, etag = rendered_index[key]
+    return cached_response(request, content, etag)
 
 # Route to serve CSS style
 @app.get("/style.css")
-async def get_css():
-    css_path = os.path.join(CURRENT_DIR, "templates", "style.css")
-    if os.path.exists(css_path):
-        return FileResponse(css_path, media_type="text/css")
+async def get_css(request: Request):
+    css = style_sheet.get()
+    if css is not None:
+        return cached_response(request, css.content, css.etag, media_type="text/css; charset=utf-8")
     return JSONResponse({"error": "style.css not found"}, status_code=404)
 
 if __name__ == "__main__":
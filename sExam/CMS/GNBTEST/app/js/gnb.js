@@ -13,10 +13,14 @@ class GNBRenderer {
   }
 
   async init() {
+    // 서버에서 렌더링된 헤더(/ssr/{lang}/header.html)가 있으면 gnb.json 을 받지 않고 이벤트만 연결
+    const container = document.getElementById(this.containerId);
+    if (container && container.querySelector('[data-ssr]')) {
+      this.bindEvents();
+      return;
+    }
     try {
-      const res = await fetch(this.jsonUrl);
-      if (!res.ok) throw new Error(`GNB JSON fetch failed: ${res.status}`);
-      this.menuData = await res.json();
+      await this.loadMenuData();
       this.render();
       this.bindEvents();
     } catch (e) {
@@ -24,6 +28,15 @@ class GNBRenderer {
     }
   }
 
+  /* gnb.json 조회 (서버 렌더링 헤더에서는 필요할 때만 호출) */
+  async loadMenuData() {
+    if (this.menuData) return this.menuData;
+    const res = await fetch(this.jsonUrl);
+    if (!res.ok) throw new Error(`GNB JSON fetch failed: ${res.status}`);
+    this.menuData = await res.json();
+    return this.menuData;
+  }
+
   render() {
     const container = document.getElementById(this.containerId);
     if (!container) return;
@@ -252,6 +265,10 @@ class GNBRenderer {
 
   /* ── 이벤트 바인딩 ── */
   bindEvents() {
+    // 같은 헤더 DOM 에 이벤트가 두 번 연결되지 않도록 #gnb 에 표시 (render() 로 새로 그리면 다시 연결)
+    const nav = document.getElementById('gnb');
+    if (!nav || nav.dataset.bound) return;
+    nav.dataset.bound = 'true';
     this.overlay = document.getElementById('gnbOverlay');
 
     /* 데스크톱: hover로 패널 열기 */
@@ -1,7 +1,10 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from collections import OrderedDict, namedtuple
+import gzip
+import hashlib
 import os
 import uvicorn
 import json
@@ -23,43 +26,196 @@ if os.path.exists(JS_DIR):
 if os.path.exists(STATIC_DIR):
     app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-if os.path.exists(KR_DIR):
-    app.mount("/kr", StaticFiles(directory=KR_DIR), name="kr")
+
+# gnb.json 후보 경로 (앞쪽 우선)
+GNB_JSON_PATHS = [
+    os.path.join(CURRENT_DIR, "templates", "gnb.json"),
+    os.path.join(CURRENT_DIR, "gnb.json"),
+    os.path.join(KR_DIR, "gnb", "gnb.json"),
+]
+
+# 캐시해 둘 최대 언어 수 (lang 은 URL 에서 오므로 무한히 늘지 않도록 제한)
+GNB_JSON_CACHE_SIZE = 32
+
+# 원본 gnb.json: (경로, mtime_ns, size), sha256, 파싱 결과
+GnbSource = namedtuple("GnbSource", ["signature", "digest", "data"])
+# lang 별 직렬화 결과: 원본 digest, JSON bytes, gzip bytes, ETag
+GnbEntry = namedtuple("GnbEntry", ["source_digest", "body", "gzip_body", "etag"])
+
+# lang 별 서버 렌더링 헤더: (원본 digest, 템플릿 mtime/size), HTML 문자열, UTF-8 bytes, gzip bytes, ETag
+HeaderEntry = namedtuple("HeaderEntry", ["source_key", "html", "body", "gzip_body", "etag"])
+
+# 서버 렌더링 헤더 템플릿 (js/gnb.js 의 buildHeaderHTML 과 같은 마크업)
+GNB_HEADER_TEMPLATE = "gnb_header.html"
+
+gnb_source = None
+gnb_json_cache = OrderedDict()  # lang -> GnbEntry (LRU)
+gnb_header_cache = OrderedDict()  # lang -> HeaderEntry (LRU)
+
+
+def localize(obj, lang):
+    """menuId, url 의 kr 을 lang 으로 바꾼 복사본"""
+    if isinstance(obj, dict):
+        new_obj = {}
+        for k, v in obj.items():
+            if k == "menuId" and isinstance(v, str):
+                new_obj[k] = v.replace("gkr", f"g{lang}")
+            elif k == "url" and isinstance(v, str):
+                new_obj[k] = v.replace("/kr/", f"/{lang}/")
+            else:
+                new_obj[k] = localize(v, lang)
+        return new_obj
+    elif isinstance(obj, list):
+        return [localize(item, lang) for item in obj]
+    return obj
+
+
+def load_gnb_source():
+    """gnb.json 이 바뀌었을 때만 다시 읽음. 없으면 None"""
+    global gnb_source
+    for path in GNB_JSON_PATHS:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature = (path, stat.st_mtime_ns, stat.st_size)
+        if gnb_source is not None and gnb_source.signature == signature:
+            return gnb_source
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if gnb_source is not None and gnb_source.digest == digest:
+            # touch 등으로 수정 시각만 바뀐 경우: 캐시 유지
+            gnb_source = gnb_source._replace(signature=signature)
+        else:
+            gnb_source = GnbSource(signature, digest, json.loads(raw))
+        return gnb_source
+    return None
+
+
+def content_etag(body):
+    return f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+
+def accepted_encodings(accept_encoding):
+    """Accept-Encoding 헤더 → {인코딩: q 값} (FASTAPI_BACKEND 의 choose_encoding 과 같은 파싱)"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def accepts_gzip(accept_encoding):
+    """gzip 을 받는지. q=0 이면 거부, gzip 이 없으면 * 의 q 값을 따름"""
+    accepted = accepted_encodings(accept_encoding)
+    return accepted.get("gzip", accepted.get("*", 0.0)) > 0
+
+
+def encoded_etag(etag, encoding):
+    """인코딩별 ETag ("abc" → "abc-gzip"). 원본과 압축본은 서로 다른 표현이므로 구분"""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match, *etags):
+    """If-None-Match 의 값 중 하나라도 etags 와 같으면 True (약한 비교, W/ 무시, * 는 항상 일치)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return not candidates.isdisjoint(etags)
+
+
+def remember(cache, lang, entry):
+    """LRU 캐시에 넣고 GNB_JSON_CACHE_SIZE 를 넘는 오래된 언어는 버림"""
+    cache[lang] = entry
+    cache.move_to_end(lang)
+    while len(cache) > GNB_JSON_CACHE_SIZE:
+        cache.popitem(last=False)
+    return entry
+
+
+def get_gnb_entry(source, lang):
+    """lang 별로 직렬화 + gzip 한 결과. 원본이 같으면 캐시에서 바로 반환"""
+    entry = gnb_json_cache.get(lang)
+    if entry is None or entry.source_digest != source.digest:
+        result = localize(source.data, lang) if lang != "kr" else source.data
+        body = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        entry = GnbEntry(source.digest, body, gzip.compress(body, mtime=0), content_etag(body))
+    return remember(gnb_json_cache, lang, entry)
+
+
+def menu_items(gnb_data):
+    """menuGroup1, menuGroup2 ... 의 depth1 항목을 순서대로 (gnb.js 의 Object.values(...).flat())"""
+    items = []
+    for group in gnb_data.values():
+        if isinstance(group, list):
+            items.extend(group)
+        else:
+            items.append(group)
+    return items
+
+
+def get_header_entry(source, lang):
+    """lang 별 서버 렌더링 헤더. gnb.json 이나 템플릿이 바뀌었을 때만 다시 렌더링"""
+    stat = os.stat(os.path.join(CURRENT_DIR, "templates", GNB_HEADER_TEMPLATE))
+    source_key = (source.digest, stat.st_mtime_ns, stat.st_size)
+    entry = gnb_header_cache.get(lang)
+    if entry is None or entry.source_key != source_key:
+        result = localize(source.data, lang) if lang != "kr" else source.data
+        html = templates.get_template(GNB_HEADER_TEMPLATE).render(lang=lang, menu_items=menu_items(result))
+        body = html.encode("utf-8")
+        entry = HeaderEntry(source_key, html, body, gzip.compress(body, mtime=0), content_etag(body))
+    return remember(gnb_header_cache, lang, entry)
+
+
+def cached_response(request, entry, media_type):
+    """캐시된 bytes 응답: If-None-Match 가 원본/압축본 ETag 중 하나와 같으면 304, gzip 을 받으면 압축본"""
+    gzip_etag = encoded_etag(entry.etag, "gzip")
+    use_gzip = accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {"ETag": gzip_etag if use_gzip else entry.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, entry.etag, gzip_etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry.gzip_body, media_type=media_type, headers=headers)
+    return Response(content=entry.body, media_type=media_type, headers=headers)
 
 
 # GNB JSON 라우트: /{lang}/gnb/gnb.json
 @app.api_route("/{lang}/gnb/gnb.json", methods=["GET", "POST"])
-async def get_gnb_json(lang: str):
-    paths_to_check = [
-        os.path.join(CURRENT_DIR, "templates", "gnb.json"),
-        os.path.join(CURRENT_DIR, "gnb.json"),
-    ]
-    json_path = next((p for p in paths_to_check if os.path.exists(p)), None)
-
-    if not json_path:
+async def get_gnb_json(lang: str, request: Request):
+    source = load_gnb_source()
+    if source is None:
         return JSONResponse({"error": "gnb.json not found"}, status_code=404)
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        gnb_data = json.load(f)
-
-    # lang != 'kr' 일 때 menuId, url, title 로컬라이즈
-    def localize(obj):
-        if isinstance(obj, dict):
-            new_obj = {}
-            for k, v in obj.items():
-                if k == "menuId" and isinstance(v, str):
-                    new_obj[k] = v.replace("gkr", f"g{lang}")
-                elif k == "url" and isinstance(v, str):
-                    new_obj[k] = v.replace("/kr/", f"/{lang}/")
-                else:
-                    new_obj[k] = localize(v)
-            return new_obj
-        elif isinstance(obj, list):
-            return [localize(item) for item in obj]
-        return obj
-
-    result = localize(gnb_data) if lang != "kr" else gnb_data
-    return JSONResponse(content=result)
+    return cached_response(request, get_gnb_entry(source, lang), "application/json")
+
+
+# /kr 정적 파일 마운트는 gnb.json 라우트 뒤에 등록: 라우트는 등록 순서대로 매칭되므로
+# /kr/gnb/gnb.json 도 캐시/ETag/gzip 을 거치고, 나머지 /kr 파일은 그대로 StaticFiles 가 제공
+if os.path.exists(KR_DIR):
+    app.mount("/kr", StaticFiles(directory=KR_DIR), name="kr")
+
+
+# 서버 렌더링 GNB 헤더: /ssr/{lang}/header.html
+# gnb.json 으로 메뉴까지 채운 헤더 HTML 한 조각 (/kr 은 StaticFiles 마운트가 가로채므로 /ssr 아래에 둠)
+@app.api_route("/ssr/{lang}/header.html", methods=["GET", "POST"])
+async def get_ssr_header(lang: str, request: Request):
+    source = load_gnb_source()
+    if source is None:
+        return JSONResponse({"error": "gnb.json not found"}, status_code=404)
+    return cached_response(request, get_header_entry(source, lang), "text/html; charset=utf-8")
 
 
 # 레이아웃 헤더 HTML (Mock)
@@ -84,7 +240,10 @@ async def get_index(request: Request):
     for page in ["index.html"]:
         page_path = os.path.join(CURRENT_DIR, "templates", page)
         if os.path.exists(page_path):
-            return templates.TemplateResponse(page, {"request": request})
+            # 헤더를 서버에서 미리 렌더링해 넣어 첫 화면에 GNB 요청이 필요 없도록 함
+            source = load_gnb_source()
+            gnb_header = get_header_entry(source, "kr").html if source is not None else ""
+            return templates.TemplateResponse(page, {"request": request, "gnb_header": gnb_header})
     return HTMLResponse(content="<h3>index.html not found</h3>", status_code=404)
 
 
@@ -0,0 +1,726 @@
+"""GNB analysis: gnb.json -> styled Excel workbook, or a node table as CSV / JSONL / Parquet
+
+Library + CLI behind parse_gnb.py, parse_gnb_root.py and parse_gnb_unified.py.
+menuGroupN keys are discovered automatically and the tree is walked once,
+iteratively, so many language trees can be processed in one process.
+
+Layouts (sheets written):
+  analysis - '오퍼링 메뉴 분석' (offering_* types) + '전체 메뉴 그룹 계층' (Depth 1-6)   [parse_gnb.py]
+  root     - '오퍼링 메뉴 분석' (all of menuGroup1) + '전체 메뉴 그룹 계층' (Depth 1-5) [parse_gnb_root.py]
+  unified  - 'GNB 통합 분석' (every node, header row frozen)                            [parse_gnb_unified.py]
+
+Every format is a sink fed node by node from the walk, so nothing is collected in
+memory first: xlsx writes the layout sheets (ExcelSink), CSV, JSONL and Parquet a flat
+node table (lang + GnbNode fields). The format follows the output extension or --format.
+
+Several trees (file list or a '{lang}' pattern) are written either as one file per
+language by a process pool (output containing '{lang}') or into one file; Excel adds a
+summary of node counts per language, type and depth.
+
+Usage:
+    python gnb_analysis.py app/kr/gnb/gnb.json -o gnb_unified_analysis.xlsx --layout unified
+    python gnb_analysis.py "app/{lang}/gnb/gnb.json" -o gnb_nodes.parquet        # all languages in one table
+    python gnb_analysis.py "app/{lang}/gnb/gnb.json" -o "gnb_{lang}.xlsx"     # one workbook per language
+    python gnb_analysis.py "app/{lang}/gnb/gnb.json" -o gnb_all.xlsx          # one workbook, sheets per language
+"""
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+
+# openpyxl is only needed for Excel output without xlsxwriter
+try:
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+    from openpyxl.utils import get_column_letter
+except ImportError:
+    openpyxl = None
+
+# pandas is only needed for the original 'openpyxl' Excel engine
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# pyarrow is optional: only needed for Parquet output
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# xlsxwriter is optional: it is the fastest engine; without it openpyxl's write-only mode is used
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+MENU_GROUP_PATTERN = re.compile(r'^menuGroup(\d+)$')
+
+# Excel engines for ExcelSink: 'auto' picks xlsxwriter when installed, otherwise 'write_only'.
+# 'openpyxl' is the original per-cell styling pass over a fully loaded workbook (slowest)
+ENGINES = ('auto', 'xlsxwriter', 'write_only', 'openpyxl')
+
+# Output formats (see SINKS): xlsx uses the layouts, the others write the flat node table
+FORMATS = ('xlsx', 'csv', 'jsonl', 'parquet')
+
+# Rows buffered per Parquet row group
+PARQUET_BATCH_ROWS = 10000
+
+# Sheet styling shared by every engine
+FONT_NAME = '맑은 고딕'
+HEADER_COLOR = '1F4E78'  # Navy
+BORDER_COLOR = 'D9D9D9'
+
+OFFERING_TYPES = frozenset([
+    'offering', 'offering_main', 'offering_cate', 'offering_sub', 'offering_item_group', 'offering_item'
+])
+
+# One row per menu node; parent_id/parent_title are None for depth-1 nodes
+GnbNode = namedtuple('GnbNode', [
+    'menu_group', 'depth', 'type', 'title', 'gnb_title', 'menu_id', 'url', 'parent_id', 'parent_title'
+])
+
+# Columns of the CSV / JSONL / Parquet node table
+NODE_COLUMNS = ('lang',) + GnbNode._fields
+
+# name: sheet name, headers: column titles, row: GnbNode -> tuple of cell values,
+# include: GnbNode -> bool, centered: headers whose cells are centered, freeze_panes: e.g. 'A2'
+SheetSpec = namedtuple('SheetSpec', ['name', 'headers', 'row', 'include', 'centered', 'freeze_panes'])
+
+# Centered columns of the analysis/root sheets
+ANALYSIS_CENTERED = frozenset(['Depth', 'Depth (깊이)', '메뉴 ID', '메뉴 ID (menuId)', '타입', '메뉴 그룹', '상위 메뉴 ID'])
+
+# untyped_type: type reported for nodes with neither type nor panelType
+Layout = namedtuple('Layout', ['name', 'untyped_type', 'sheets', 'default_output'])
+
+
+def discover_menu_groups(gnb):
+    """menuGroupN keys of gnb.json in numeric order (menuGroup2 before menuGroup10)"""
+    groups = [(int(m.group(1)), key) for key in gnb if (m := MENU_GROUP_PATTERN.match(key))]
+    return [key for _, key in sorted(groups)]
+
+
+def walk(gnb, untyped_type='untyped', menu_groups=None):
+    """Yield a GnbNode for every menu node, depth-first in document order.
+    Uses an explicit stack, so arbitrarily deep trees do not hit the recursion limit"""
+    for menu_group in menu_groups or discover_menu_groups(gnb):
+        stack = [(item, 1, None) for item in reversed(gnb.get(menu_group) or [])]
+        while stack:
+            item, depth, parent = stack.pop()
+            node = GnbNode(
+                menu_group,
+                depth,
+                item.get('type') or item.get('panelType') or untyped_type,
+                item.get('title', ''),
+                item.get('gnb_title', ''),
+                item.get('menuId', ''),
+                item.get('url', ''),
+                parent.menu_id if parent else None,
+                parent.title if parent else None,
+            )
+            yield node
+            children = item.get('items') or []
+            stack.extend((child, depth + 1, node) for child in reversed(children))
+
+
+def hierarchy_row(max_depth):
+    """Row builder placing the title under its 'Depth N' column"""
+    def row(node):
+        depth_titles = [''] * max_depth
+        if 1 <= node.depth <= max_depth:
+            title = node.title
+            if node.depth == 1 and node.gnb_title:
+                title = f"{node.title} ({node.gnb_title})"
+            depth_titles[node.depth - 1] = title
+        return (node.menu_group, node.type, node.depth, *depth_titles, node.menu_id, node.url)
+    return row
+
+
+def hierarchy_sheet(max_depth):
+    headers = ['메뉴 그룹', '타입', 'Depth'] + [f'Depth {n}' for n in range(1, max_depth + 1)] + ['메뉴 ID', 'URL']
+    return SheetSpec('전체 메뉴 그룹 계층', headers, hierarchy_row(max_depth), lambda node: True,
+                     ANALYSIS_CENTERED, None)
+
+
+def offering_sheet(include):
+    return SheetSpec(
+        '오퍼링 메뉴 분석',
+        ['메뉴 그룹', '타입', '타이틀', 'GNB 타이틀', '메뉴 ID (menuId)', 'Depth (깊이)', '이동 URL', '상위 메뉴명', '상위 메뉴 ID'],
+        attrgetter('menu_group', 'type', 'title', 'gnb_title', 'menu_id', 'depth', 'url', 'parent_title', 'parent_id'),
+        include,
+        ANALYSIS_CENTERED,
+        None,
+    )
+
+
+UNIFIED_SHEET = SheetSpec(
+    'GNB 통합 분석',
+    ['메뉴그룹', '타입', '타이틀', 'menuid', 'gnb 타이틀', 'depth', '이동 URL', '상위 메뉴명', '상위 메뉴ID'],
+    lambda node: (node.menu_group, node.type, node.title, node.menu_id, node.gnb_title, node.depth, node.url,
+                  node.parent_title or '', node.parent_id or ''),
+    lambda node: True,
+    frozenset(['메뉴그룹', '타입', 'menuid', 'depth', '상위 메뉴ID']),
+    'A2',
+)
+
+LAYOUTS = {
+    'analysis': Layout('analysis', 'unknown', [
+        offering_sheet(lambda node: node.type in OFFERING_TYPES),
+        hierarchy_sheet(6),
+    ], 'gnb_analysis.xlsx'),
+    'root': Layout('root', 'untyped', [
+        offering_sheet(lambda node: node.menu_group == 'menuGroup1'),
+        hierarchy_sheet(5),
+    ], 'gnb_analysis.xlsx'),
+    'unified': Layout('unified', 'untyped', [UNIFIED_SHEET], 'gnb_unified_analysis.xlsx'),
+}
+
+
+def load_gnb(json_path):
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def expand_inputs(inputs):
+    """[(lang, path), ...] for the given paths; a '{lang}' in a path is globbed and the matched part is the lang.
+    Plain paths take the lang from '.../{lang}/gnb/gnb.json', else the file name"""
+    trees = []
+    for pattern in inputs:
+        if '{lang}' not in pattern:
+            parts = os.path.normpath(pattern).split(os.sep)
+            lang = parts[-3] if len(parts) >= 3 and parts[-2] == 'gnb' else os.path.splitext(parts[-1])[0]
+            trees.append((lang, pattern))
+            continue
+        prefix, suffix = pattern.split('{lang}', 1)
+        for path in sorted(glob.glob(prefix + '*' + suffix)):
+            lang = path[len(prefix):len(path) - len(suffix)]
+            if os.sep not in lang and '/' not in lang:
+                trees.append((lang, path))
+    return unique_langs(trees)
+
+
+def unique_langs(trees):
+    """Suffix repeated langs (gnb, gnb-2, ...) so sheets, summary rows and '{lang}' outputs stay apart"""
+    seen = Counter()
+    unique = []
+    for lang, path in trees:
+        seen[lang] += 1
+        unique.append((lang if seen[lang] == 1 else f'{lang}-{seen[lang]}', path))
+    return unique
+
+
+def summary_sheet(counts_by_lang):
+    """'요약' sheet: one row per (language, type) with node counts per depth and a total"""
+    max_depth = max((depth for counts in counts_by_lang.values() for _, depth in counts), default=0)
+    headers = ['언어', '타입'] + [f'Depth {n}' for n in range(1, max_depth + 1)] + ['합계']
+    rows = []
+    for lang, counts in counts_by_lang.items():
+        for item_type in sorted({item_type for item_type, _ in counts}):
+            by_depth = [counts.get((item_type, depth), 0) for depth in range(1, max_depth + 1)]
+            rows.append((lang, item_type, *by_depth, sum(by_depth)))
+    spec = SheetSpec('요약', headers, None, None, frozenset(headers), 'A2')
+    return spec, rows
+
+
+def unique_sheet_name(name, taken):
+    """name cut to Excel's 31 characters, with ' (2)', ' (3)', ... when that is already taken"""
+    candidate = name[:31]
+    number = 1
+    while candidate in taken:
+        number += 1
+        suffix = f' ({number})'
+        candidate = name[:31 - len(suffix)] + suffix
+    return candidate
+
+
+def write_excel_openpyxl(sheets, excel_path):
+    """Original path: pandas → openpyxl workbook, then style and measure every cell"""
+    writer = pd.ExcelWriter(excel_path, engine='openpyxl')
+    for spec, rows in sheets:
+        pd.DataFrame(rows, columns=spec.headers).to_excel(writer, sheet_name=spec.name, index=False)
+
+    # Formatting using openpyxl
+    workbook = writer.book
+
+    # Colors & Fonts
+    header_font = Font(name=FONT_NAME, size=11, bold=True, color='FFFFFF')
+    header_fill = PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type='solid')
+    data_font = Font(name=FONT_NAME, size=10)
+    border_side = Side(style='thin', color=BORDER_COLOR)
+    data_border = Border(left=border_side, right=border_side, top=border_side, bottom=border_side)
+    align_left = Alignment(horizontal='left', vertical='center')
+    align_center = Alignment(horizontal='center', vertical='center')
+
+    for spec, _ in sheets:
+        ws = workbook[spec.name]
+        ws.views.sheetView[0].showGridLines = True
+
+        # Enable header styling
+        for col_idx in range(1, ws.max_column + 1):
+            cell = ws.cell(row=1, column=col_idx)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = align_center
+            cell.border = data_border
+
+        # Format data cells
+        for row_idx in range(2, ws.max_row + 1):
+            for col_idx in range(1, ws.max_column + 1):
+                cell = ws.cell(row=row_idx, column=col_idx)
+                cell.font = data_font
+                cell.border = data_border
+                header_name = ws.cell(row=1, column=col_idx).value
+                cell.alignment = align_center if header_name in spec.centered else align_left
+
+        if spec.freeze_panes:
+            ws.freeze_panes = spec.freeze_panes
+
+        # Adjust column widths (non-ASCII characters count double)
+        for col in ws.columns:
+            max_len = 0
+            col_letter = get_column_letter(col[0].column)
+            for cell in col:
+                val_str = str(cell.value or '')
+                cell_len = 0
+                for char in val_str:
+                    if ord(char) > 127:
+                        cell_len += 2
+                    else:
+                        cell_len += 1
+                max_len = max(max_len, cell_len)
+            ws.column_dimensions[col_letter].width = max(max_len + 4, 12)
+
+    writer.close()
+
+
+class NodeSink:
+    """Writes (lang, GnbNode) rows one at a time; use as a context manager.
+    A sink with measure_first gets every node of a tree through measure() before write()"""
+    measure_first = False
+
+    def measure(self, lang, node):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvSink(NodeSink):
+    """UTF-8 CSV with BOM so Excel shows Korean titles correctly; None becomes an empty field"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(NODE_COLUMNS)
+
+    def write(self, lang, node):
+        self.writer.writerow((lang, *node))
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlSink(NodeSink):
+    """One JSON object per line"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, lang, node):
+        self.file.write(json.dumps(dict(zip(NODE_COLUMNS, (lang, *node))), ensure_ascii=False))
+        self.file.write('\n')
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink(NodeSink):
+    """Parquet written in row groups of PARQUET_BATCH_ROWS, so memory stays bounded"""
+
+    def __init__(self, path):
+        if pa is None:
+            raise SystemExit("pyarrow is required for Parquet output (pip install pyarrow)")
+        self.schema = pa.schema([(name, pa.int32() if name == 'depth' else pa.string()) for name in NODE_COLUMNS])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.columns = {name: [] for name in NODE_COLUMNS}
+        self.buffered = 0
+
+    def write(self, lang, node):
+        for name, value in zip(NODE_COLUMNS, (lang, *node)):
+            self.columns[name].append(value)
+        self.buffered += 1
+        if self.buffered >= PARQUET_BATCH_ROWS:
+            self.flush()
+
+    def flush(self):
+        if self.buffered:
+            self.writer.write_table(pa.Table.from_pydict(self.columns, schema=self.schema))
+            self.columns = {name: [] for name in NODE_COLUMNS}
+            self.buffered = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def text_width(text):
+    """Width of text as in the original scripts: non-ASCII characters count double"""
+    return 2 * len(text) - len(text.encode('ascii', 'ignore'))
+
+
+class ColumnWidths:
+    """Column widths kept up to date row by row: longest text (header included) + 4, at least 12.
+    Values count as str(value or ''), like the original per-cell pass"""
+
+    def __init__(self, headers):
+        self.lengths = [text_width(str(header)) for header in headers]
+
+    def update(self, row):
+        lengths = self.lengths
+        for index, value in enumerate(row):
+            if value:
+                length = text_width(str(value))
+                if length > lengths[index]:
+                    lengths[index] = length
+
+    @property
+    def widths(self):
+        return [max(length + 4, 12) for length in self.lengths]
+
+
+class ExcelSheet:
+    """One worksheet of an ExcelBook: its SheetSpec, the engine's sheet object and the running widths.
+    The header row is written on start(), so the spec may be filled in after the sheet was created"""
+
+    def __init__(self, handle, spec=None):
+        self.handle = handle
+        self.spec = spec
+        self.widths = ColumnWidths(spec.headers) if spec else None
+        self.started = False
+
+
+class XlsxwriterBook:
+    """xlsxwriter in constant_memory mode: rows are streamed to disk, formats are created once.
+    Column widths are applied on close, so no measuring pass is needed"""
+    measure_first = False
+
+    def __init__(self, path):
+        self.workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        base = {'font_name': FONT_NAME, 'border': 1, 'border_color': f'#{BORDER_COLOR}', 'valign': 'vcenter'}
+        self.header_format = self.workbook.add_format({**base, 'font_size': 11, 'bold': True, 'font_color': '#FFFFFF',
+                                                       'bg_color': f'#{HEADER_COLOR}', 'align': 'center'})
+        self.data_formats = {
+            False: self.workbook.add_format({**base, 'font_size': 10, 'align': 'left'}),
+            True: self.workbook.add_format({**base, 'font_size': 10, 'align': 'center'}),
+        }
+        self.sheets = []
+
+    def add_sheet(self, name, spec=None):
+        sheet = ExcelSheet(self.workbook.add_worksheet(name), spec)
+        self.sheets.append(sheet)
+        return sheet
+
+    def start(self, sheet):
+        ws, spec = sheet.handle, sheet.spec
+        if spec.freeze_panes:
+            ws.freeze_panes(spec.freeze_panes)
+        for col_idx, header in enumerate(spec.headers):
+            ws.write(0, col_idx, header, self.header_format)
+        sheet.formats = [self.data_formats[header in spec.centered] for header in spec.headers]
+        sheet.next_row = 1
+        sheet.started = True
+
+    def append(self, sheet, row):
+        if not sheet.started:
+            self.start(sheet)
+        ws, formats, row_idx = sheet.handle, sheet.formats, sheet.next_row
+        for col_idx, value in enumerate(row):
+            if value is None:
+                ws.write_blank(row_idx, col_idx, None, formats[col_idx])
+            else:
+                ws.write(row_idx, col_idx, value, formats[col_idx])
+        sheet.next_row += 1
+        sheet.widths.update(row)
+
+    def close(self):
+        for sheet in self.sheets:
+            if not sheet.started:
+                self.start(sheet)
+            for index, width in enumerate(sheet.widths.widths):
+                sheet.handle.set_column(index, index, width)
+        self.workbook.close()
+
+
+class WriteOnlyBook:
+    """openpyxl write-only workbook: rows are streamed, the three cell styles are registered once as named styles.
+    Column widths are written before the first row, so the sink measures every tree in a first walk"""
+    measure_first = True
+
+    def __init__(self, path):
+        self.path = path
+        self.workbook = openpyxl.Workbook(write_only=True)
+        border_side = Side(style='thin', color=BORDER_COLOR)
+        border = Border(left=border_side, right=border_side, top=border_side, bottom=border_side)
+        self.workbook.add_named_style(NamedStyle(
+            'gnb_header', font=Font(name=FONT_NAME, size=11, bold=True, color='FFFFFF'),
+            fill=PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type='solid'),
+            border=border, alignment=Alignment(horizontal='center', vertical='center')))
+        data_font = Font(name=FONT_NAME, size=10)
+        self.workbook.add_named_style(NamedStyle(
+            'gnb_data', font=data_font, border=border, alignment=Alignment(horizontal='left', vertical='center')))
+        self.workbook.add_named_style(NamedStyle(
+            'gnb_data_center', font=data_font, border=border,
+            alignment=Alignment(horizontal='center', vertical='center')))
+        self.sheets = []
+
+    def add_sheet(self, name, spec=None):
+        sheet = ExcelSheet(self.workbook.create_sheet(name), spec)
+        self.sheets.append(sheet)
+        return sheet
+
+    def styled(self, ws, value, style):
+        cell = WriteOnlyCell(ws, value)
+        cell.style = style
+        return cell
+
+    def start(self, sheet):
+        ws, spec = sheet.handle, sheet.spec
+        for index, width in enumerate(sheet.widths.widths, 1):
+            ws.column_dimensions[get_column_letter(index)].width = width
+        if spec.freeze_panes:
+            ws.freeze_panes = spec.freeze_panes
+        ws.append([self.styled(ws, header, 'gnb_header') for header in spec.headers])
+        sheet.styles = ['gnb_data_center' if header in spec.centered else 'gnb_data' for header in spec.headers]
+        sheet.started = True
+
+    def append(self, sheet, row):
+        if not sheet.started:
+            self.start(sheet)
+        ws = sheet.handle
+        ws.append([self.styled(ws, value, style) for value, style in zip(row, sheet.styles)])
+
+    def close(self):
+        for sheet in self.sheets:
+            if not sheet.started:
+                self.start(sheet)
+        self.workbook.save(self.path)
+
+
+class OpenpyxlBook:
+    """Original path (slowest, not streamed): rows are kept per sheet and styled cell by cell on close"""
+    measure_first = False
+
+    def __init__(self, path):
+        self.path = path
+        self.sheets = []
+
+    def add_sheet(self, name, spec=None):
+        sheet = ExcelSheet(name, spec)
+        sheet.rows = []
+        self.sheets.append(sheet)
+        return sheet
+
+    def append(self, sheet, row):
+        sheet.rows.append(row)
+
+    def close(self):
+        write_excel_openpyxl([(sheet.spec._replace(name=sheet.handle), sheet.rows) for sheet in self.sheets],
+                             self.path)
+
+
+def excel_book(path, engine='auto'):
+    """Workbook writer for one of ENGINES; 'auto' picks xlsxwriter when installed, otherwise 'write_only'"""
+    if engine == 'auto':
+        engine = 'xlsxwriter' if xlsxwriter is not None else 'write_only'
+    if engine == 'xlsxwriter':
+        if xlsxwriter is None:
+            raise SystemExit("xlsxwriter is not installed (pip install xlsxwriter)")
+        return XlsxwriterBook(path)
+    if openpyxl is None:
+        raise SystemExit("openpyxl is required for Excel output (pip install openpyxl)")
+    if engine == 'write_only':
+        return WriteOnlyBook(path)
+    if pd is None:
+        raise SystemExit("pandas is required for the openpyxl engine (pip install pandas)")
+    return OpenpyxlBook(path)
+
+
+class ExcelSink(NodeSink):
+    """Styled workbook with the sheets of a layout; every node goes to the sheets whose include() accepts it.
+    combined: sheets are named '{lang} {sheet}' for every language, after a '요약' sheet with the
+    node counts per language, type and depth. layout=None gives an empty workbook for write_sheet()"""
+
+    def __init__(self, path, layout='unified', engine='auto', combined=False):
+        self.specs = LAYOUTS[layout].sheets if layout else []
+        self.book = excel_book(path, engine)
+        self.measure_first = self.book.measure_first
+        self.combined = combined
+        self.sheets = {}  # lang -> [ExcelSheet per layout sheet]
+        self.names = set()
+        self.counts = {}  # lang -> Counter of (type, depth), for the summary
+        self.summary = self.add_sheet('요약') if combined else None
+        if not combined:
+            # Same sheets for every node, created up front so an empty tree still gets its header rows
+            self.lang_sheets(None)
+
+    def add_sheet(self, name, spec=None):
+        name = unique_sheet_name(name, self.names)
+        self.names.add(name)
+        return self.book.add_sheet(name, spec)
+
+    def lang_sheets(self, lang):
+        if not self.combined:
+            lang = None
+        sheets = self.sheets.get(lang)
+        if sheets is None:
+            sheets = self.sheets[lang] = [
+                self.add_sheet(f'{lang} {spec.name}' if self.combined else spec.name, spec)
+                for spec in self.specs
+            ]
+        return sheets
+
+    def measure(self, lang, node):
+        for sheet in self.lang_sheets(lang):
+            if sheet.spec.include(node):
+                sheet.widths.update(sheet.spec.row(node))
+
+    def write(self, lang, node):
+        if self.combined:
+            self.counts.setdefault(lang, Counter())[node.type, node.depth] += 1
+        for sheet in self.lang_sheets(lang):
+            if sheet.spec.include(node):
+                self.book.append(sheet, sheet.spec.row(node))
+
+    def write_sheet(self, spec, rows, sheet=None):
+        """Write a whole sheet of ready-made rows (e.g. the summary), into `sheet` or a new one"""
+        if sheet is None:
+            sheet = self.add_sheet(spec.name)
+        sheet.spec, sheet.widths = spec, ColumnWidths(spec.headers)
+        for row in rows:
+            sheet.widths.update(row)
+        for row in rows:
+            self.book.append(sheet, row)
+
+    def close(self):
+        if self.summary is not None:
+            self.write_sheet(*summary_sheet(self.counts), sheet=self.summary)
+        self.book.close()
+
+
+SINKS = {'xlsx': ExcelSink, 'csv': CsvSink, 'jsonl': JsonlSink, 'parquet': ParquetSink}
+
+
+def open_sink(fmt, path, layout='unified', engine='auto', combined=False):
+    """Sink for one output file: the layout sheets for xlsx, the flat node table otherwise"""
+    if fmt == 'xlsx':
+        return ExcelSink(path, layout, engine, combined)
+    return SINKS[fmt](path)
+
+
+def stream_tree(sink, lang, gnb, untyped_type='untyped'):
+    """Feed every node of one tree to the sink, after a measuring walk when the sink needs one.
+    Returns the node counts per (type, depth)"""
+    if sink.measure_first:
+        for node in walk(gnb, untyped_type):
+            sink.measure(lang, node)
+    counts = Counter()
+    for node in walk(gnb, untyped_type):
+        counts[node.type, node.depth] += 1
+        sink.write(lang, node)
+    return counts
+
+
+def export_tree(lang, json_path, output_path, fmt, layout='unified', engine='auto'):
+    """Worker: stream the nodes of one tree into its own file. Returns (path, Counter of (type, depth))"""
+    with open_sink(fmt, output_path, layout, engine) as sink:
+        counts = stream_tree(sink, lang, load_gnb(json_path), LAYOUTS[layout].untyped_type)
+    return output_path, counts
+
+
+def export_nodes(trees, output, fmt, layout='unified', engine='auto', workers=None,
+                 summary_path='gnb_summary.xlsx', combined=None):
+    """Stream [(lang, path), ...] into xlsx / CSV / JSONL / Parquet and return the written paths.
+    '{lang}' in output writes one file per language in a process pool (plus, for xlsx, a summary workbook
+    at summary_path); otherwise all languages share one file. combined (default: several trees) names the
+    Excel sheets per language and adds the summary sheet"""
+    if '{lang}' in output:
+        jobs = [(lang, path, output.replace('{lang}', lang), fmt, layout, engine) for lang, path in trees]
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(jobs))) as pool:
+            results = list(pool.map(export_tree, *zip(*jobs)))
+        paths = [path for path, _ in results]
+        if fmt == 'xlsx':
+            with ExcelSink(summary_path, None, engine) as sink:
+                sink.write_sheet(*summary_sheet({lang: counts for (lang, _), (_, counts) in zip(trees, results)}))
+            paths.append(summary_path)
+        return paths
+
+    if combined is None:
+        combined = len(trees) > 1
+    with open_sink(fmt, output, layout, engine, combined) as sink:
+        for lang, path in trees:
+            stream_tree(sink, lang, load_gnb(path), LAYOUTS[layout].untyped_type)
+    return [output]
+
+
+def output_format(output, requested=None):
+    """--format if given, else the output file extension (xlsx when unknown)"""
+    if requested:
+        return requested
+    extension = os.path.splitext(output or '')[1].lstrip('.').lower()
+    return extension if extension in FORMATS else 'xlsx'
+
+
+def analyze(json_path, excel_path=None, layout='unified', engine='auto'):
+    """Analyze one gnb.json into an Excel workbook and return the output path"""
+    excel_path = excel_path or LAYOUTS[layout].default_output
+    return export_nodes([('kr', json_path)], excel_path, 'xlsx', layout, engine)[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GNB gnb.json analysis → Excel / CSV / JSONL / Parquet")
+    parser.add_argument('input', nargs='+', help="gnb.json path(s); '{lang}' in a path is globbed per language")
+    parser.add_argument('-o', '--output',
+                        help="Output path (default depends on --format / --layout); "
+                             "with several trees, '{lang}' in it writes one file per language")
+    parser.add_argument('--format', choices=FORMATS,
+                        help="Output format (default: from the output extension, else xlsx)")
+    parser.add_argument('--layout', choices=sorted(LAYOUTS), default='unified',
+                        help="Sheet layout for xlsx; also decides the type of untyped nodes (default: unified)")
+    parser.add_argument('--engine', choices=ENGINES, default='auto',
+                        help="Excel engine (default: auto = xlsxwriter if installed, else openpyxl write-only)")
+    parser.add_argument('--workers', type=int, help="Worker processes for several trees (default: CPU count)")
+    parser.add_argument('--summary', default='gnb_summary.xlsx',
+                        help="Summary workbook when writing one workbook per language (default: gnb_summary.xlsx)")
+    args = parser.parse_args(argv)
+
+    trees = expand_inputs(args.input)
+    if not trees:
+        raise SystemExit("No gnb.json found for: " + ", ".join(args.input))
+
+    fmt = output_format(args.output, args.format)
+    single = len(trees) == 1 and '{lang}' not in args.input[0]
+    if fmt != 'xlsx':
+        output = args.output or f'gnb_nodes.{fmt}'
+    elif single:
+        output = args.output or LAYOUTS[args.layout].default_output
+    else:
+        output = args.output or '{lang}_' + LAYOUTS[args.layout].default_output
+
+    label = 'Excel' if fmt == 'xlsx' else fmt.upper()
+    for path in export_nodes(trees, output, fmt, args.layout, args.engine, args.workers, args.summary,
+                             combined=not single):
+        print(f"{label} file created successfully at:", path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""GNB validation: check gnb.json trees for structural mistakes before they ship
+
+Built on the traversal of gnb_analysis.py (the one behind parse_gnb.py). Every tree is
+walked once and its nodes are indexed by menuId, url and parent in dicts, so the checks
+run in linear time however large the tree is.
+
+Checks (per language unless noted):
+  duplicate-menu-id   - the same menuId on several nodes
+  duplicate-url       - the same link url on several nodes
+  dangling-url        - a leaf link (no-child, *_item) without a usable url
+  missing-type        - depth 1 without panelType / deeper node without type
+  unknown-type        - a type the GNB renderer does not know
+  depth               - a known type at the wrong depth
+  orphan              - a node whose parent has the wrong type (e.g. offering_* under normal_*)
+  empty-group         - a panel/group type without children
+  lang-mismatch       - (across languages) menuIds or types that differ between languages;
+                        menuIds are compared without their 'g{lang}' prefix (gkr12 ~ gen12)
+
+Usage:
+    python gnb_validate.py app/kr/gnb/gnb.json
+    python gnb_validate.py "app/{lang}/gnb/gnb.json"               # every language + cross-language check
+    python gnb_validate.py "app/{lang}/gnb/gnb.json" --reference kr --format jsonl
+Exits with status 1 when any issue is found.
+"""
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import sys
+
+from gnb_analysis import expand_inputs, load_gnb, walk
+
+# Expected depth and parent type of every node type rendered by js/gnb.js
+# (depth 1 types come from panelType, deeper ones from type)
+TYPE_RULES = {
+    'offering': (1, None),
+    'offering_main': (2, 'offering'),
+    'offering_cate': (3, 'offering_main'),
+    'offering_sub': (4, 'offering_cate'),
+    'offering_item_group': (5, 'offering_sub'),
+    'offering_item': (6, 'offering_item_group'),
+    'normal': (1, None),
+    'normal_main': (2, 'normal'),
+    'normal_cate': (3, 'normal_main'),
+    'normal_item': (4, 'normal_cate'),
+    'no-child': (1, None),
+}
+
+# Types that are clicked through to a page and therefore need a url
+LEAF_TYPES = frozenset(['no-child', 'offering_item', 'normal_item'])
+
+# Types that only make sense with children
+GROUP_TYPES = frozenset(TYPE_RULES) - LEAF_TYPES
+
+# urls that do not lead anywhere
+PLACEHOLDER_URLS = frozenset(['', '#', 'javascript:void(0)', 'javascript:;'])
+
+CHECKS = ('duplicate-menu-id', 'duplicate-url', 'dangling-url', 'missing-type', 'unknown-type',
+          'depth', 'orphan', 'empty-group', 'lang-mismatch')
+
+# One finding; menu_id is '' when the issue is not about a single node
+Issue = namedtuple('Issue', ['lang', 'check', 'menu_id', 'title', 'detail'])
+
+
+def menu_key(menu_id, lang):
+    """menuId without its language prefix, so the same menu matches across languages (gkr12 -> 12)"""
+    prefix = f'g{lang}'
+    return menu_id[len(prefix):] if menu_id.startswith(prefix) else menu_id
+
+
+def validate_tree(gnb, lang):
+    """Validate one tree in a single walk.
+    Returns (issues, {menu key: (menuId, type)}) - the second is used for the cross-language check"""
+    issues = []
+    by_id = {}                  # menuId -> first GnbNode with it
+    by_url = {}                 # url -> first GnbNode linking to it
+    child_count = Counter()     # walk ordinal of the parent -> number of children
+    duplicate_ids = defaultdict(list)
+    duplicate_urls = defaultdict(list)
+    groups = []                 # (walk ordinal, GnbNode) of nodes whose type needs children
+    keys = {}
+
+    # The walk is depth-first, so the parent of a node at depth d is the last node seen at depth d - 1
+    # of the same menu group; this stays correct even when menuIds are duplicated.
+    # Nodes are told apart by their walk ordinal
+    last_at_depth = []          # [(ordinal, GnbNode), ...] from depth 1 down to the current parent
+    menu_group = depth1_items = None
+    for ordinal, node in enumerate(walk(gnb, untyped_type='')):
+        if node.menu_group != menu_group:
+            menu_group, last_at_depth = node.menu_group, []
+            depth1_items = iter(gnb.get(menu_group) or [])
+        if node.depth == 1:
+            # gnb.js only reads panelType at depth 1, while walk() prefers type; every check below
+            # (rule, empty-group, the children's parent type) uses the panelType
+            item = next(depth1_items)
+            node = node._replace(type=item.get('panelType') or '')
+        del last_at_depth[node.depth - 1:]
+        parent_ordinal, parent = last_at_depth[-1] if last_at_depth else (None, None)
+        last_at_depth.append((ordinal, node))
+        if parent is not None:
+            child_count[parent_ordinal] += 1
+        if node.type in GROUP_TYPES:
+            groups.append((ordinal, node))
+
+        def report(check, detail):
+            issues.append(Issue(lang, check, node.menu_id, node.title, detail))
+
+        if node.menu_id:
+            first = by_id.setdefault(node.menu_id, node)
+            if first is not node:
+                duplicate_ids[node.menu_id].append(node)
+            keys.setdefault(menu_key(node.menu_id, lang), (node.menu_id, node.type))
+
+        if node.url not in PLACEHOLDER_URLS:
+            first = by_url.setdefault(node.url, node)
+            if first is not node:
+                duplicate_urls[node.url].append(node)
+        elif node.type in LEAF_TYPES:
+            report('dangling-url', f"{node.type} link without url ({node.url or 'empty'})")
+
+        if node.depth == 1 and not node.type:
+            ignored = f" (type '{item['type']}' is ignored at depth 1)" if item.get('type') else ''
+            report('missing-type', 'no panelType' + ignored)
+            continue
+        elif not node.type:
+            report('missing-type', 'no type')
+            continue
+        rule = TYPE_RULES.get(node.type)
+        if rule is None:
+            report('unknown-type', f"type '{node.type}'")
+            continue
+        depth, parent_type = rule
+        if node.depth != depth:
+            report('depth', f"{node.type} at depth {node.depth}, expected {depth}")
+        if parent is not None and parent.type != parent_type:
+            expected = f"under {parent_type}" if parent_type else "at depth 1"
+            report('orphan', f"{node.type} under {parent.type or 'untyped'} '{parent.menu_id}', expected {expected}")
+
+    for menu_id, nodes in duplicate_ids.items():
+        first = by_id[menu_id]
+        places = ', '.join(f"{n.menu_group} depth {n.depth} '{n.title}'" for n in [first] + nodes)
+        issues.append(Issue(lang, 'duplicate-menu-id', menu_id, first.title, f"{len(nodes) + 1} nodes: {places}"))
+    for url, nodes in duplicate_urls.items():
+        first = by_url[url]
+        ids = ', '.join(n.menu_id or '?' for n in [first] + nodes)
+        issues.append(Issue(lang, 'duplicate-url', first.menu_id, first.title, f"{url} used by {ids}"))
+    for ordinal, node in groups:
+        if not child_count[ordinal]:
+            issues.append(Issue(lang, 'empty-group', node.menu_id, node.title, f"{node.type} without items"))
+    return issues, keys
+
+
+def validate_file(lang, json_path):
+    """Worker: validate one gnb.json"""
+    issues, keys = validate_tree(load_gnb(json_path), lang)
+    return lang, issues, keys
+
+
+def compare_languages(keys_by_lang, reference=None):
+    """lang-mismatch issues: menus missing from, added to or typed differently in each language
+    compared with the reference language (default: kr if present, else the first one)"""
+    if len(keys_by_lang) < 2:
+        return []
+    if reference not in keys_by_lang:
+        reference = 'kr' if 'kr' in keys_by_lang else next(iter(keys_by_lang))
+    expected = keys_by_lang[reference]
+    issues = []
+    for lang, keys in keys_by_lang.items():
+        if lang == reference:
+            continue
+        for key, (menu_id, item_type) in expected.items():
+            if key not in keys:
+                issues.append(Issue(lang, 'lang-mismatch', menu_id, '', f"{item_type} in {reference}, missing in {lang}"))
+            elif keys[key][1] != item_type:
+                other_id, other_type = keys[key]
+                issues.append(Issue(lang, 'lang-mismatch', other_id, '',
+                                    f"type {other_type or 'untyped'}, {reference} {menu_id} is {item_type or 'untyped'}"))
+        for key in keys.keys() - expected.keys():
+            menu_id, item_type = keys[key]
+            issues.append(Issue(lang, 'lang-mismatch', menu_id, '', f"{item_type} not in {reference}"))
+    return issues
+
+
+def validate_many(trees, reference=None, workers=None):
+    """Validate [(lang, path), ...] (in a process pool when there are several) and return every Issue"""
+    if len(trees) == 1:
+        results = [validate_file(*trees[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(trees))) as pool:
+            results = list(pool.map(validate_file, *zip(*trees)))
+    issues = [issue for _, lang_issues, _ in results for issue in lang_issues]
+    issues += compare_languages({lang: keys for lang, _, keys in results}, reference)
+    return issues
+
+
+def print_report(issues, out=sys.stdout):
+    """Issues grouped per language and check, then a count per check"""
+    grouped = defaultdict(list)
+    for issue in issues:
+        grouped[issue.lang, issue.check].append(issue)
+    for (lang, check), group in sorted(grouped.items(), key=lambda item: (item[0][0], CHECKS.index(item[0][1]))):
+        print(f"[{lang}] {check} ({len(group)})", file=out)
+        for issue in group:
+            label = f"{issue.menu_id} '{issue.title}'" if issue.title else issue.menu_id
+            print(f"  {label}: {issue.detail}", file=out)
+    counts = Counter(issue.check for issue in issues)
+    summary = ', '.join(f"{check} {counts[check]}" for check in CHECKS if counts[check])
+    print(f"{len(issues)} issue(s){': ' + summary if summary else ''}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate gnb.json trees")
+    parser.add_argument('input', nargs='+', help="gnb.json path(s); '{lang}' in a path is globbed per language")
+    parser.add_argument('--reference', help="Language the others are compared with (default: kr if present)")
+    parser.add_argument('--format', choices=('text', 'jsonl'), default='text',
+                        help="Report format (default: text)")
+    parser.add_argument('--ignore', nargs='+', choices=CHECKS, default=[], help="Checks to leave out")
+    parser.add_argument('--workers', type=int, help="Worker processes for several trees (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    trees = expand_inputs(args.input)
+    if not trees:
+        raise SystemExit("No gnb.json found for: " + ", ".join(args.input))
+
+    ignored = set(args.ignore)
+    issues = [issue for issue in validate_many(trees, args.reference, args.workers) if issue.check not in ignored]
+    if args.format == 'jsonl':
+        for issue in issues:
+            print(json.dumps(issue._asdict(), ensure_ascii=False))
+    else:
+        print_report(issues)
+    return 1 if issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
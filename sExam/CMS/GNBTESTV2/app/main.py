@@ -1,7 +1,10 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from collections import OrderedDict, namedtuple
+import gzip
+import hashlib
 import os
 import uvicorn
 import json
@@ -23,43 +26,144 @@ if os.path.exists(JS_DIR):
 if os.path.exists(STATIC_DIR):
     app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-if os.path.exists(KR_DIR):
-    app.mount("/kr", StaticFiles(directory=KR_DIR), name="kr")
+
+# gnb.json 후보 경로 (앞쪽 우선)
+GNB_JSON_PATHS = [
+    os.path.join(CURRENT_DIR, "templates", "gnb.json"),
+    os.path.join(CURRENT_DIR, "gnb.json"),
+    os.path.join(KR_DIR, "gnb", "gnb.json"),
+]
+
+# 캐시해 둘 최대 언어 수 (lang 은 URL 에서 오므로 무한히 늘지 않도록 제한)
+GNB_JSON_CACHE_SIZE = 32
+
+# 원본 gnb.json: (경로, mtime_ns, size), sha256, 파싱 결과
+GnbSource = namedtuple("GnbSource", ["signature", "digest", "data"])
+# lang 별 직렬화 결과: 원본 digest, JSON bytes, gzip bytes, ETag
+GnbEntry = namedtuple("GnbEntry", ["source_digest", "body", "gzip_body", "etag"])
+
+gnb_source = None
+gnb_json_cache = OrderedDict()  # lang -> GnbEntry (LRU)
+
+
+def localize(obj, lang):
+    """menuId, url 의 kr 을 lang 으로 바꾼 복사본"""
+    if isinstance(obj, dict):
+        new_obj = {}
+        for k, v in obj.items():
+            if k == "menuId" and isinstance(v, str):
+                new_obj[k] = v.replace("gkr", f"g{lang}")
+            elif k == "url" and isinstance(v, str):
+                new_obj[k] = v.replace("/kr/", f"/{lang}/")
+            else:
+                new_obj[k] = localize(v, lang)
+        return new_obj
+    elif isinstance(obj, list):
+        return [localize(item, lang) for item in obj]
+    return obj
+
+
+def load_gnb_source():
+    """gnb.json 이 바뀌었을 때만 다시 읽음. 없으면 None"""
+    global gnb_source
+    for path in GNB_JSON_PATHS:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature = (path, stat.st_mtime_ns, stat.st_size)
+        if gnb_source is not None and gnb_source.signature == signature:
+            return gnb_source
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if gnb_source is not None and gnb_source.digest == digest:
+            # touch 등으로 수정 시각만 바뀐 경우: 캐시 유지
+            gnb_source = gnb_source._replace(signature=signature)
+        else:
+            gnb_source = GnbSource(signature, digest, json.loads(raw))
+        return gnb_source
+    return None
+
+
+def accepted_encodings(accept_encoding):
+    """Accept-Encoding 헤더 → {인코딩: q 값} (FASTAPI_BACKEND 의 choose_encoding 과 같은 파싱)"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def accepts_gzip(accept_encoding):
+    """gzip 을 받는지. q=0 이면 거부, gzip 이 없으면 * 의 q 값을 따름"""
+    accepted = accepted_encodings(accept_encoding)
+    return accepted.get("gzip", accepted.get("*", 0.0)) > 0
+
+
+def encoded_etag(etag, encoding):
+    """인코딩별 ETag ("abc" → "abc-gzip"). 원본과 압축본은 서로 다른 표현이므로 구분"""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match, *etags):
+    """If-None-Match 의 값 중 하나라도 etags 와 같으면 True (약한 비교, W/ 무시, * 는 항상 일치)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return not candidates.isdisjoint(etags)
+
+
+def get_gnb_entry(source, lang):
+    """lang 별로 직렬화 + gzip 한 결과. 원본이 같으면 캐시에서 바로 반환"""
+    entry = gnb_json_cache.get(lang)
+    if entry is None or entry.source_digest != source.digest:
+        result = localize(source.data, lang) if lang != "kr" else source.data
+        body = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        entry = GnbEntry(source.digest, body, gzip.compress(body, mtime=0), etag)
+        gnb_json_cache[lang] = entry
+    gnb_json_cache.move_to_end(lang)
+    while len(gnb_json_cache) > GNB_JSON_CACHE_SIZE:
+        gnb_json_cache.popitem(last=False)
+    return entry
 
 
 # GNB JSON 라우트: /{lang}/gnb/gnb.json
 @app.api_route("/{lang}/gnb/gnb.json", methods=["GET", "POST"])
-async def get_gnb_json(lang: str):
-    paths_to_check = [
-        os.path.join(CURRENT_DIR, "templates", "gnb.json"),
-        os.path.join(CURRENT_DIR, "gnb.json"),
-    ]
-    json_path = next((p for p in paths_to_check if os.path.exists(p)), None)
-
-    if not json_path:
+async def get_gnb_json(lang: str, request: Request):
+    source = load_gnb_source()
+    if source is None:
         return JSONResponse({"error": "gnb.json not found"}, status_code=404)
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        gnb_data = json.load(f)
-
-    # lang != 'kr' 일 때 menuId, url, title 로컬라이즈
-    def localize(obj):
-        if isinstance(obj, dict):
-            new_obj = {}
-            for k, v in obj.items():
-                if k == "menuId" and isinstance(v, str):
-                    new_obj[k] = v.replace("gkr", f"g{lang}")
-                elif k == "url" and isinstance(v, str):
-                    new_obj[k] = v.replace("/kr/", f"/{lang}/")
-                else:
-                    new_obj[k] = localize(v)
-            return new_obj
-        elif isinstance(obj, list):
-            return [localize(item) for item in obj]
-        return obj
-
-    result = localize(gnb_data) if lang != "kr" else gnb_data
-    return JSONResponse(content=result)
+    entry = get_gnb_entry(source, lang)
+    # 원본과 gzip 압축본은 ETag 를 따로 두고, If-None-Match 는 둘 중 어느 것이든 인정
+    gzip_etag = encoded_etag(entry.etag, "gzip")
+    use_gzip = accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {"ETag": gzip_etag if use_gzip else entry.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, entry.etag, gzip_etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=entry.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# /kr 정적 파일 마운트는 gnb.json 라우트 뒤에 등록: 라우트는 등록 순서대로 매칭되므로
+# /kr/gnb/gnb.json 도 캐시/ETag/gzip 을 거치고, 나머지 /kr 파일은 그대로 StaticFiles 가 제공
+if os.path.exists(KR_DIR):
+    app.mount("/kr", StaticFiles(directory=KR_DIR), name="kr")
 
 
 # 레이아웃 헤더 HTML (Mock)
@@ -1,7 +1,11 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from contextlib import asynccontextmanager
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import quote
+import anyio
+import hashlib
 import rjsmin
 import os
 import uuid
@@ -88,7 +92,8 @@ async def minify_js(file: UploadFile = File(...)):
         
         # JavaScript Minify
         minified_content = rjsmin.jsmin(original_content)
-        minified_size = len(minified_content.encode('utf-8'))
+        minified_bytes = minified_content.encode('utf-8')
+        minified_size = len(minified_bytes)
         
         # 고유 ID 생성
         file_id = str(uuid.uuid4())
@@ -99,13 +104,14 @@ async def minify_js(file: UploadFile = File(...)):
         
         # 압축된 파일 저장
         minified_path = MINIFIED_DIR / f"{file_id}.min.js"
-        with open(minified_path, 'w', encoding='utf-8') as f:
-            f.write(minified_content)
+        with open(minified_path, 'wb') as f:
+            f.write(minified_bytes)
         
-        # 파일 매핑 저장
+        # 파일 매핑 저장 (etag: 압축 결과의 SHA-256)
         file_mappings[file_id] = {
             'path': minified_path,
-            'filename': minified_filename
+            'filename': minified_filename,
+            'etag': hashlib.sha256(minified_bytes).hexdigest()
         }
         
         return {
@@ -124,9 +130,76 @@ async def minify_js(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"압축 중 오류 발생: {str(e)}")
 
 
+# ----- 다운로드 캐시 / Range 처리 -----
+# file_id 는 한 번 만들어지면 내용이 바뀌지 않으므로 1년 + immutable 로 캐시 허용
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+def content_disposition(filename: str) -> str:
+    """다운로드 파일명 헤더 (한글 등 비 ASCII 이름은 RFC 5987 형식)"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """If-None-Match / If-Modified-Since 조건을 만족하면 True (304 응답 대상)"""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        if if_none_match.strip() == '*':
+            return True
+        return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+    
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def parse_range(range_header: str, size: int):
+    """단일 bytes 범위 파싱. (start, end) / None (무시) / () (416)"""
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    start_text, dash, end_text = spec.strip().partition('-')
+    if not dash:
+        return None
+    try:
+        if start_text == '':
+            length = int(end_text)
+            if length <= 0 or size == 0:
+                return ()
+            return max(size - length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return ()
+    return start, min(end, size - 1)
+
+
+async def iter_file_range(path: Path, start: int, end: int):
+    """파일의 [start, end] 구간을 청크 단위로 읽기"""
+    async with await anyio.open_file(path, 'rb') as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
 @app.get("/download/{file_id}")
-async def download_file(file_id: str):
-    """압축된 파일 다운로드"""
+async def download_file(file_id: str, request: Request):
+    """압축된 파일 다운로드 (ETag/Last-Modified 304, Range 206 지원)"""
     
     if file_id not in file_mappings:
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
@@ -137,10 +210,45 @@ async def download_file(file_id: str):
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="파일이 삭제되었습니다.")
     
+    stat = file_path.stat()
+    etag = f'"{file_info["etag"]}"'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+        'Cache-Control': IMMUTABLE_CACHE_CONTROL,
+        'Accept-Ranges': 'bytes'
+    }
+    
+    # 클라이언트가 같은 파일을 가지고 있으면 304
+    if is_not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+    
+    # Range 요청 (이어받기). If-Range 가 현재 ETag 와 다르면 전체 전송
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    if range_header and (if_range is None or if_range.strip() == etag):
+        byte_range = parse_range(range_header, stat.st_size)
+        if byte_range == ():
+            headers['Content-Range'] = f"bytes */{stat.st_size}"
+            return Response(status_code=416, headers=headers)
+        if byte_range is not None:
+            start, end = byte_range
+            headers['Content-Range'] = f"bytes {start}-{end}/{stat.st_size}"
+            headers['Content-Length'] = str(end - start + 1)
+            headers['Content-Disposition'] = content_disposition(file_info['filename'])
+            return StreamingResponse(
+                iter_file_range(file_path, start, end),
+                status_code=206,
+                media_type='application/javascript',
+                headers=headers
+            )
+    
     return FileResponse(
         path=file_path,
         filename=file_info['filename'],
-        media_type='application/javascript'
+        media_type='application/javascript',
+        headers=headers,
+        stat_result=stat
     )
 
 